@@ -16,9 +16,12 @@ TEMPLATE_DIR = BASE_DIR / "template"
 ENV_DIR = BASE_DIR / "venv"
 
 COMPANIES_FILE = COMPANY_DATASET_DIR / "companies.json"
+COMPANIES_SNAPSHOT = COMPANY_DATASET_DIR / "companies.bin"  # compiled, mmap-able copy of companies.json
 RESUME_DIR = WEB_DATA_DIR / "resume"
 PDF_DIR = WEB_DATA_DIR / "pdf"
 ANALYSIS_DIR = WEB_DATA_DIR / "analysis"
+ASSESSMENT_DB = WEB_DATA_DIR / "assessments.db"
+AFFINITY_DB = WEB_DATA_DIR / "affinity.db"  # cached resume-to-company match vectors
 
 # Ensure directories exist
 os.makedirs(RESUME_DIR, exist_ok=True)
@@ -49,3 +52,43 @@ if not GEMINI_API_KEY:
     print("Warning: GEMINI_API_KEY not found under GEMINI_API_KEY.")
 if not GROQ_API_KEY:
     print("Warning: GROQ_API_KEY not found. Fallback to Groq will not work.")
+
+# =================================== Retention ====================================
+# Budgets for the background sweeper, per named directory: max file age (seconds) and max total size (bytes).
+# Oldest files are evicted first; 0 disables a budget.
+MB = 1024 * 1024
+RETENTION_POLICIES = {
+    "resume": {
+        "path": RESUME_DIR,
+        "max_age": int(os.getenv("RESUME_MAX_AGE", 24 * 3600)),
+        "max_bytes": int(os.getenv("RESUME_MAX_BYTES", 200 * MB))
+    },
+    "pdf": {
+        "path": PDF_DIR,
+        "max_age": int(os.getenv("PDF_MAX_AGE", 24 * 3600)),
+        "max_bytes": int(os.getenv("PDF_MAX_BYTES", 200 * MB))
+    },
+    "analysis": {
+        "path": ANALYSIS_DIR,
+        "max_age": int(os.getenv("ANALYSIS_MAX_AGE", 30 * 24 * 3600)),
+        "max_bytes": int(os.getenv("ANALYSIS_MAX_BYTES", 100 * MB))
+    }
+}
+# Persisted affinity vectors (AFFINITY_DB): rows older than AFFINITY_MAX_AGE are dropped,
+# then the oldest rows beyond AFFINITY_MAX_ROWS; 0 disables a budget.
+AFFINITY_MAX_AGE = int(os.getenv("AFFINITY_MAX_AGE", 30 * 24 * 3600))
+AFFINITY_MAX_ROWS = int(os.getenv("AFFINITY_MAX_ROWS", 50000))
+# In-memory affinity vectors per worker, counted in (company row, mask) entries: ~120 bytes each, ~30 MB
+AFFINITY_CACHE_ROWS = int(os.getenv("AFFINITY_CACHE_ROWS", 250000))
+SWEEP_INTERVAL = int(os.getenv("SWEEP_INTERVAL", 600))  # seconds between sweeps
+SWEEP_GRACE = int(os.getenv("SWEEP_GRACE", 600))        # files newer than this are never evicted
+
+# =================================== Dataset Reload ====================================
+COMPANIES_RELOAD_INTERVAL = int(os.getenv("COMPANIES_RELOAD_INTERVAL", 5))  # seconds between mtime checks
+COMPANIES_MMAP = os.getenv("COMPANIES_MMAP", "0") == "1"  # share one mmap-ed snapshot across workers
+
+# =================================== Resume Parsing ====================================
+RESUME_PROMPT_CHARS = 4000                                              # resume chars sent to the LLM
+RESUME_CHAR_BUDGET = int(os.getenv("RESUME_CHAR_BUDGET", 20000))        # stop reading pages after this many chars
+RESUME_PARSE_TIMEOUT = int(os.getenv("RESUME_PARSE_TIMEOUT", 15))       # hard per-document limit (seconds)
+RESUME_PARSE_WORKERS = int(os.getenv("RESUME_PARSE_WORKERS", 2))        # process pool size
@@ -0,0 +1,22 @@
+import pypdf
+
+# ================================ PDF Text Extraction ================================
+# Runs inside the resume-parsing process pool. This is the only module the pool's
+# forkserver preloads, so it stays outside app.services: importing anything from
+# the package would pull the whole service layer into every worker.
+def read_pdf_text(path, max_chars=0):
+    """
+    Extracts text page by page, stopping as soon as `max_chars` characters
+    have been collected (0 = read every page).
+    """
+    reader = pypdf.PdfReader(path)
+    parts = []
+    total = 0
+    for page in reader.pages:
+        page_text = (page.extract_text() or "") + "\n"
+        parts.append(page_text)
+        total += len(page_text)
+        if max_chars and total >= max_chars:
+            break
+    text = "".join(parts)
+    return text[:max_chars] if max_chars else text
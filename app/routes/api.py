@@ -3,12 +3,16 @@ import json
 import time
 from collections import defaultdict
 from fastapi import APIRouter, HTTPException, UploadFile, File, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse, JSONResponse
+from starlette.background import BackgroundTask
 
 from app.config import RESUME_DIR, PDF_DIR
 from app.models import AssessmentSubmission
 from app.quiz import QUESTIONS_DB
 from app.services.ai_service import run_full_assessment
+from app.services.cleanup_service import sweeper
+from app.services.asset_service import json_asset, asset_response
 
 router = APIRouter(prefix="/api")
 
@@ -31,6 +35,18 @@ class RateLimiter:
 
 limiter = RateLimiter(requests_per_minute=5)
 
+# ================================ Security: Local-only Guard ================================
+LOCAL_HOSTS = {"127.0.0.1", "::1", "localhost"}
+
+# Function to restrict operational endpoints to the server itself
+def require_local(request: Request):
+    if request.client is None or request.client.host not in LOCAL_HOSTS:
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+# Question payloads serialized once at startup (served with ETag / Cache-Control)
+QUESTION_PAYLOADS = {mode: json_asset(questions) for mode, questions in QUESTIONS_DB.items()}
+QUESTIONS_CACHE_CONTROL = "public, max-age=3600"
+
 # ================================= Backend APIs =================================
 # ------------------- API that returns report(pdf) from server to client -------------------
 # activate when client presses "download button"
@@ -42,8 +58,11 @@ async def get_report(filename: str):
 
     file_path = os.path.join(PDF_DIR, filename)
 
+    # Lease the report so the retention sweeper can't delete it mid-download
+    sweeper.acquire(file_path)
     if os.path.exists(file_path):
-        return FileResponse(file_path)
+        return FileResponse(file_path, background=BackgroundTask(sweeper.release, file_path))
+    sweeper.release(file_path)
     return JSONResponse(status_code=404, content={"error": "File not found"})
 
 # ------------------- API that uploads resume from client to server -------------------
@@ -74,10 +93,10 @@ async def upload_resume(request: Request, file: UploadFile = File(...)):
 # ------------------- API that returns(shows) questions from server to client -------------------
 # activate when client presses "fast", "balanced" or "detailed" button
 @router.get("/questions/{mode}") 
-async def get_questions(mode: str):
-    if mode not in QUESTIONS_DB:
+async def get_questions(request: Request, mode: str):
+    if mode not in QUESTION_PAYLOADS:
         raise HTTPException(status_code=404, detail="Invalid mode")
-    return QUESTIONS_DB[mode]
+    return asset_response(request, QUESTION_PAYLOADS[mode], QUESTIONS_CACHE_CONTROL)
 
 # ------------------- API that return answers and user's resume back to server -------------------
 # activate when client presses "submit" button or "analyze resume" button
@@ -89,8 +108,17 @@ async def generate_assessment(request: Request, submission: AssessmentSubmission
 
     try:
         # 2. Delegate to AI Service (which handles the full orchestration)
-        return run_full_assessment(submission)
+        # Blocking work (resume parsing pool, Gemini call, PDF) runs off the event loop
+        return await run_in_threadpool(run_full_assessment, submission)
 
     except Exception as e:
         print(f"Server Error (Assess): {str(e)}")
         return JSONResponse(status_code=500, content={"error": "Internal Server Error"})
+
+# ------------------- API that returns storage retention metrics -------------------
+# local-only operational data; also rate limited
+@router.get("/metrics/storage")
+async def storage_metrics(request: Request):
+    require_local(request)
+    limiter.check(request.client.host)
+    return sweeper.metrics()
@@ -1,14 +1,26 @@
-from fastapi import APIRouter
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, Request
 from app.config import TEMPLATE_DIR, STATIC_DIR
+from app.services.asset_service import load_static_assets, render_index, asset_response, static_cache_control
 
 router = APIRouter()
 
+# Precomputed once at startup: bytes, gzip/br variants, ETags, hashed URLs
+STATIC_ASSETS = load_static_assets(STATIC_DIR)
+INDEX_PAGE = render_index(TEMPLATE_DIR / 'index.html', STATIC_ASSETS)
+
 #=================================== Frontend APIs ===================================
-@router.get("/")
-async def read_index():
-    return FileResponse(TEMPLATE_DIR / 'index.html')
+@router.api_route("/", methods=["GET", "HEAD"])
+async def read_index(request: Request):
+    return asset_response(request, INDEX_PAGE)
+
+@router.api_route("/script.js", methods=["GET", "HEAD"])
+async def read_script(request: Request):
+    asset = STATIC_ASSETS['script.js']
+    return asset_response(request, asset, static_cache_control(request, asset))
 
-@router.get("/script.js")
-async def read_script():
-    return FileResponse(STATIC_DIR / 'script.js')
+@router.api_route("/static/{path:path}", methods=["GET", "HEAD"])
+async def read_static(request: Request, path: str):
+    asset = STATIC_ASSETS.get(path)
+    if asset is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return asset_response(request, asset, static_cache_control(request, asset))
@@ -1,6 +1,10 @@
+from .affinity_service import affinity_index
 from .ai_service import analyze_profile, run_full_assessment
+from .cleanup_service import sweeper
+from .company_service import company_index
 from .matching_service import rank_companies
 from .pdf_service import generate_pdf
 from .resume_service import extract_resume_text
+from .storage_service import assessment_store, export_jsonl, query_assessments
 
 print("Services initialized")
\ No newline at end of file
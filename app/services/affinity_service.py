@@ -0,0 +1,271 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+from app.config import AFFINITY_DB, AFFINITY_CACHE_ROWS, AFFINITY_MAX_AGE, AFFINITY_MAX_ROWS
+from app.services.matching_service import compile_matcher, word_pattern
+
+# ================================ Affinity Vectors ================================
+# A vector is a sparse {row: bitmask} over the companies of one dataset snapshot:
+# bit 0 = role matched, bit i+1 = skill i matched. Role/skill patterns never span a
+# newline, so the profile text can be cut into segments (each answer line, and the
+# resume block) and a company's bits for the whole profile are the OR of its bits
+# per segment. Segments repeat across requests, so their vectors are cached; resume
+# vectors are also persisted by content hash.
+RESUME_SEPARATOR = "\n--- RESUME CONTENT ---\n"
+AFFINITY_VERSION = 1  # bump when word_pattern / bit layout changes
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS resume_affinity (
+    resume_hash TEXT NOT NULL,
+    dataset TEXT NOT NULL,
+    vector TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (resume_hash, dataset)
+);
+CREATE INDEX IF NOT EXISTS idx_resume_affinity_created ON resume_affinity (created_at);
+"""
+
+def _row_matchers(companies):
+    """Yields (row, role pattern, skill patterns) for a CompanySnapshot or MappedCompanies."""
+    if hasattr(companies, 'decode'):
+        for row in range(len(companies)):
+            role, skills = companies.match_fields(row)
+            yield row, (word_pattern(role) if role else None), [word_pattern(s) for s in skills]
+    else:
+        for row, company in enumerate(companies):
+            matcher = companies.matchers.get(company.get('id')) or compile_matcher(company)
+            yield row, matcher.role, matcher.skills
+
+def _match_fields(companies):
+    if hasattr(companies, 'decode'):
+        for row in range(len(companies)):
+            yield companies.match_fields(row)
+    else:
+        for company in companies:
+            yield company.get('role', '').lower(), [s.lower() for s in company.get('skills', [])]
+
+def segment_vector(companies, segment):
+    """Regex scan of one lowercased segment against every company (the expensive part)."""
+    vector = {}
+    for row, role, skills in _row_matchers(companies):
+        mask = 1 if role and role.search(segment) else 0
+        for i, pattern in enumerate(skills):
+            if pattern.search(segment):
+                mask |= 2 << i
+        if mask:
+            vector[row] = mask
+    return vector
+
+def merge_into(combined, vector):
+    for row, mask in vector.items():
+        combined[row] = combined.get(row, 0) | mask
+    return combined
+
+# ================================ Vector Cache ================================
+class VectorCache:
+    """
+    LRU of vectors bounded by entry count and by total stored rows: one vector
+    can hold a row for most of the dataset (e.g. "a: python"), so the entry
+    count alone doesn't bound memory. Not thread-safe; AffinityIndex locks it.
+    """
+    def __init__(self, max_entries, max_rows):
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self.rows = 0
+        self._items = OrderedDict()
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key):
+        vector = self._items.get(key)
+        if vector is not None:
+            self._items.move_to_end(key)
+        return vector
+
+    def put(self, key, vector):
+        if len(vector) > self.max_rows:
+            return  # would evict everything else
+        old = self._items.pop(key, None)
+        if old is not None:
+            self.rows -= len(old)
+        self._items[key] = vector
+        self.rows += len(vector)
+        while len(self._items) > self.max_entries or self.rows > self.max_rows:
+            _, evicted = self._items.popitem(last=False)
+            self.rows -= len(evicted)
+
+    def clear(self):
+        self._items.clear()
+        self.rows = 0
+
+# ================================ Affinity Index ================================
+class AffinityIndex:
+    """
+    Caches segment vectors per dataset fingerprint. Resume vectors live in
+    SQLite (survive restarts, shared by workers); answer lines in an LRU.
+    A new companies.json gives a new fingerprint, which drops old vectors.
+    Persisted rows are pruned to `max_age` / `max_rows` on open and by the sweeper.
+    """
+    def __init__(self, db_path=AFFINITY_DB, line_cache_size=8192, resume_cache_size=256, cache_rows=AFFINITY_CACHE_ROWS,
+                 max_age=AFFINITY_MAX_AGE, max_rows=AFFINITY_MAX_ROWS):
+        self.db_path = db_path
+        self.max_age = max_age
+        self.max_rows = max_rows
+        # Row budget split between answer lines and resumes
+        self._lines = VectorCache(line_cache_size, cache_rows // 2)
+        self._resumes = VectorCache(resume_cache_size, cache_rows // 2)
+        self._fingerprints = weakref.WeakKeyDictionary()
+        self._lock = threading.RLock()  # also guards the shared SQLite connection
+        self._conn = None
+        self.stats = {"line_hits": 0, "line_misses": 0, "resume_hits": 0, "resume_db_hits": 0, "resume_misses": 0}
+
+    # ----------------------------- Storage -----------------------------
+    def _db(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+            try:
+                self.prune()
+            except sqlite3.Error as e:
+                print(f"Affinity Store Error: {e}")
+        return self._conn
+
+    def prune(self, now=None):
+        """Drops rows older than `max_age`, then the oldest beyond `max_rows`. Returns rows deleted."""
+        now = time.time() if now is None else now
+        deleted = 0
+        with self._lock, self._db() as conn:
+            if self.max_age:
+                deleted += conn.execute("DELETE FROM resume_affinity WHERE created_at < ?",
+                                        (now - self.max_age,)).rowcount
+            if self.max_rows:
+                deleted += conn.execute(
+                    "DELETE FROM resume_affinity WHERE rowid IN "
+                    "(SELECT rowid FROM resume_affinity ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_rows,)
+                ).rowcount
+        return deleted
+
+    def _load_resume(self, resume_hash, dataset):
+        with self._lock:
+            row = self._db().execute(
+                "SELECT vector FROM resume_affinity WHERE resume_hash = ? AND dataset = ?", (resume_hash, dataset)
+            ).fetchone()
+        return {r: m for r, m in json.loads(row[0])} if row else None
+
+    def _save_resume(self, resume_hash, dataset, vector):
+        with self._lock, self._db() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO resume_affinity (resume_hash, dataset, vector, created_at) VALUES (?, ?, ?, ?)",
+                (resume_hash, dataset, json.dumps(list(vector.items())), time.time())
+            )
+
+    def _invalidate(self, dataset):
+        """Drops vectors computed against any other dataset."""
+        with self._lock:
+            self._lines.clear()
+            self._resumes.clear()
+            with self._db() as conn:
+                conn.execute("DELETE FROM resume_affinity WHERE dataset != ?", (dataset,))
+
+    # ----------------------------- Fingerprint -----------------------------
+    def fingerprint(self, companies):
+        """Content hash of the matching fields, or None if this dataset can't be indexed."""
+        try:
+            return self._fingerprints[companies]
+        except KeyError:
+            pass
+        except TypeError:
+            return None  # plain lists: no index
+
+        digest = hashlib.sha256(f"v{AFFINITY_VERSION}".encode())
+        for role, skills in _match_fields(companies):
+            if "\n" in role or any("\n" in s for s in skills):
+                fp = None  # a pattern could span segments
+                break
+            digest.update(json.dumps([role, skills]).encode("utf-8"))
+        else:
+            fp = digest.hexdigest()[:32]
+
+        with self._lock:
+            known = set(self._fingerprints.values())
+            self._fingerprints[companies] = fp
+        if fp and fp not in known:
+            try:
+                self._invalidate(fp)
+            except sqlite3.Error as e:
+                print(f"Affinity Store Error: {e}")
+        return fp
+
+    # ----------------------------- Lookups -----------------------------
+    def _cached(self, cache, key):
+        with self._lock:
+            return cache.get(key)
+
+    def _remember(self, cache, key, vector):
+        with self._lock:
+            cache.put(key, vector)
+
+    def line_vector(self, companies, dataset, line):
+        key = (dataset, line)
+        vector = self._cached(self._lines, key)
+        if vector is None:
+            self.stats["line_misses"] += 1
+            vector = segment_vector(companies, line)
+            self._remember(self._lines, key, vector)
+        else:
+            self.stats["line_hits"] += 1
+        return vector
+
+    def resume_vector(self, companies, dataset, resume_section):
+        """Vector for the resume block, computed at most once per resume content and dataset."""
+        segment = resume_section.lower()
+        resume_hash = hashlib.sha256(segment.encode("utf-8")).hexdigest()
+        key = (dataset, resume_hash)
+
+        vector = self._cached(self._resumes, key)
+        if vector is not None:
+            self.stats["resume_hits"] += 1
+            return vector
+
+        try:
+            vector = self._load_resume(resume_hash, dataset)
+        except sqlite3.Error as e:
+            print(f"Affinity Store Error: {e}")
+            vector = None
+        if vector is not None:
+            self.stats["resume_db_hits"] += 1
+        else:
+            self.stats["resume_misses"] += 1
+            vector = segment_vector(companies, segment)
+            try:
+                self._save_resume(resume_hash, dataset, vector)
+            except sqlite3.Error as e:
+                print(f"Affinity Store Error: {e}")
+        self._remember(self._resumes, key, vector)
+        return vector
+
+    def profile_affinity(self, companies, answers_context, resume_section=""):
+        """
+        Match bits of `answers_context + resume_section` for every company, for
+        rank_companies(affinity=...). Returns None if the dataset can't be indexed.
+        """
+        dataset = self.fingerprint(companies)
+        if dataset is None:
+            return None
+
+        combined = {}
+        for line in set(answers_context.lower().split("\n")):
+            merge_into(combined, self.line_vector(companies, dataset, line))
+        if resume_section:
+            merge_into(combined, self.resume_vector(companies, dataset, resume_section))
+        return combined
+
+affinity_index = AffinityIndex()
@@ -1,11 +1,11 @@
 import json
-import os
 import time
 import requests
 from google import genai
 from groq import Groq
 
-from app.config import GEMINI_API_KEY, GROQ_API_KEY, ANALYSIS_DIR
+from app.config import GEMINI_API_KEY, GROQ_API_KEY, RESUME_PROMPT_CHARS
+from app.services.storage_service import assessment_store
 
 # ================================ LLM Model Setup =============================
 gemini_client = None
@@ -117,6 +117,8 @@ def analyze_profile(user_context, candidates_json, mode, answers, resume_extract
     """
 
     ai_data = None
+    provider_used = None
+    timings = {}
     
     # Provider Chain
     providers = [
@@ -126,21 +128,25 @@ def analyze_profile(user_context, candidates_json, mode, answers, resume_extract
     ]
     
     for name, func in providers:
+        start = time.perf_counter()
         try:
             print(f"Attempting Provider: {name}")
             raw_text = func(prompt)
             ai_data = clean_json_response(raw_text)
             if ai_data:
                 print(f"Success with {name}")
+                provider_used = name
                 break
         except Exception as e:
             print(f"{name} Failed/Skipped: {e}")
             continue
+        finally:
+            timings[name] = round(time.perf_counter() - start, 3)
 
     # Final Fallback (Mock) if all failed
     if not ai_data:
         print("All AI Providers failed. Using Mock Data.")
-        return {
+        ai_data = {
             "readiness_score": 0,
             "strengths": ["System Error"],
             "gaps": ["AI Service Unavailable"],
@@ -150,24 +156,18 @@ def analyze_profile(user_context, candidates_json, mode, answers, resume_extract
             "job_recommendations": []
         }
 
-    # Save Log
+    # Save Log (queued; written to SQLite by the background writer)
     try:
-        timestamp = int(time.time())
-        analysis_path = os.path.join(ANALYSIS_DIR, f"analysis_{timestamp}.json")
-        with open(analysis_path, "w") as f:
-            json.dump({
-                "timestamp": timestamp,
-                "mode": mode,
-                "provider_used": "unknown",
-                "response": ai_data
-            }, f, indent=4)
-    except:
-        pass
+        assessment_store.record(mode, answers, provider_used, timings, ai_data, resume_used=resume_extracted)
+    except Exception as e:
+        print(f"Assessment Log Error: {e}")
         
     return ai_data
 
 # ========================== Orchestration Logic =============================
-from app.quiz import QUESTIONS_DB, companies_data
+from app.quiz import QUESTIONS_DB
+from app.services.company_service import company_index
+from app.services.affinity_service import affinity_index, RESUME_SEPARATOR
 from app.services.resume_service import extract_resume_text
 from app.services.matching_service import rank_companies
 from app.services.pdf_service import generate_pdf
@@ -182,25 +182,30 @@ def run_full_assessment(submission):
     """
 
     # 1. User Data variables
-    user_context_for_ranking = submission.get_formatted_context(QUESTIONS_DB)
+    answers_context = submission.get_formatted_context(QUESTIONS_DB)
     user_preferences = submission.get_user_preferences()
 
     # 2. Resume text extraction
     resume_text_full = ""
+    resume_section = ""
     if submission.resume_filename:
         if not submission.resume_filename.lower().endswith('.pdf'):
                 print(f"Warning: Attempt to access non-pdf file {submission.resume_filename}")
         else:
             resume_text_full = extract_resume_text(submission.resume_filename)
-            user_context_for_ranking += f"\n--- RESUME CONTENT ---\n{resume_text_full}"
-
-    # 3. Company ranking variables
-    top_candidates = rank_companies(user_context_for_ranking, companies_data, user_preferences)
+            resume_section = f"{RESUME_SEPARATOR}{resume_text_full}"
+    user_context_for_ranking = answers_context + resume_section
+
+    # 3. Company ranking variables (one snapshot per request; reloads swap it atomically)
+    # Resume matches come from the affinity index (computed once per resume content)
+    companies = company_index.snapshot()
+    affinity = affinity_index.profile_affinity(companies, answers_context, resume_section)
+    top_candidates = rank_companies(user_context_for_ranking, companies, user_preferences, affinity=affinity)
     
     # 4. Quiz and resume prompt for Gemini
-    user_context_for_gemini = submission.get_formatted_context(QUESTIONS_DB)
+    user_context_for_gemini = answers_context
     if resume_text_full:
-        user_context_for_gemini += f"\n--- RESUME CONTENT ---\n{resume_text_full[:4000]}..."
+        user_context_for_gemini += f"{RESUME_SEPARATOR}{resume_text_full[:RESUME_PROMPT_CHARS]}..."
     
     # 5. Top 5 companies for Gemini
     candidates_json = json.dumps([{
@@ -0,0 +1,116 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+
+from fastapi import Request, Response
+
+try:
+    import brotli  # Optional: `pip install brotli` to also serve br
+except ImportError:
+    brotli = None
+
+# ================================ Cache Policies ================================
+IMMUTABLE = "public, max-age=31536000, immutable"   # content-hashed URLs
+REVALIDATE = "no-cache"                             # always revalidate (cheap 304 via ETag)
+MIN_COMPRESS_SIZE = 512
+
+# ================================ Precomputed Asset ================================
+class Asset:
+    """
+    A response body prepared once: identity/gzip/brotli variants, each with
+    its own strong ETag, plus a short content digest for cache-busting URLs.
+    """
+    def __init__(self, body, content_type):
+        self.content_type = content_type
+        self.digest = hashlib.sha256(body).hexdigest()[:16]
+        self.variants = {"identity": body}
+        if len(body) >= MIN_COMPRESS_SIZE:
+            gz = gzip.compress(body, compresslevel=9, mtime=0)
+            if len(gz) < len(body):
+                self.variants["gzip"] = gz
+            if brotli is not None:
+                br = brotli.compress(body, quality=11)
+                if len(br) < len(body):
+                    self.variants["br"] = br
+        self.etags = {enc: f'"{self.digest}-{enc}"' for enc in self.variants}
+
+def _accepted_encodings(request):
+    accepted = set()
+    for part in request.headers.get("accept-encoding", "").split(","):
+        token, _, params = part.strip().partition(";")
+        if token and params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            accepted.add(token.lower())
+    return accepted
+
+def _etag_matches(request, etag):
+    """True if If-None-Match names `etag`, the tag of the encoding negotiated for this request."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in {t.strip().removeprefix("W/") for t in header.split(",")}
+
+def asset_response(request: Request, asset: Asset, cache_control=REVALIDATE):
+    """Serves the best encoding the client accepts (headers only for HEAD), or 304 if its cached copy is current."""
+    accepted = _accepted_encodings(request)
+    encoding = next((e for e in ("br", "gzip") if e in asset.variants and e in accepted), "identity")
+    headers = {"ETag": asset.etags[encoding], "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+
+    if _etag_matches(request, asset.etags[encoding]):
+        return Response(status_code=304, headers=headers)
+
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    body = asset.variants[encoding]
+    if request.method == "HEAD":
+        headers["Content-Length"] = str(len(body))
+        return Response(media_type=asset.content_type, headers=headers)
+    return Response(content=body, media_type=asset.content_type, headers=headers)
+
+# ================================ Builders ================================
+def json_asset(data):
+    """Serializes `data` once, byte-for-byte like FastAPI's JSONResponse."""
+    body = json.dumps(data, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+    return Asset(body, "application/json")
+
+def file_asset(path):
+    with open(path, "rb") as f:
+        body = f.read()
+    content_type = mimetypes.guess_type(str(path))[0] or "application/octet-stream"
+    if content_type.startswith("text/") or content_type in ("application/javascript", "application/json"):
+        content_type += "; charset=utf-8"
+    return Asset(body, content_type)
+
+def load_static_assets(directory):
+    """Precomputes every file under `directory`, keyed by its URL path relative to it."""
+    assets = {}
+    for root, _, files in os.walk(directory):
+        for name in files:
+            path = os.path.join(root, name)
+            assets[os.path.relpath(path, directory).replace(os.sep, "/")] = file_asset(path)
+    return assets
+
+LOCAL_ASSET_REF = re.compile(r'(href|src)="/?(static/)?([^":?#]+\.(?:css|js))(\?[^"]*)?"')
+
+def render_index(path, static_assets):
+    """Rewrites local css/js references in the page to content-hashed URLs."""
+    with open(path, "r", encoding="utf-8") as f:
+        html = f.read()
+
+    def versioned(match):
+        attr, static_prefix, name = match.group(1), match.group(2), match.group(3)
+        asset = static_assets.get(name)
+        if asset is None:
+            return match.group(0)
+        url = f"/{static_prefix or ''}{name}?v={asset.digest}"
+        return f'{attr}="{url}"'
+
+    return Asset(LOCAL_ASSET_REF.sub(versioned, html).encode("utf-8"), "text/html; charset=utf-8")
+
+def static_cache_control(request, asset):
+    """Immutable when the URL carries the current content hash, otherwise revalidate."""
+    return IMMUTABLE if request.query_params.get("v") == asset.digest else REVALIDATE
@@ -0,0 +1,198 @@
+import ctypes
+import os
+import platform
+import threading
+import time
+from collections import defaultdict
+
+from app.config import RETENTION_POLICIES, SWEEP_INTERVAL, SWEEP_GRACE
+from app.services.affinity_service import affinity_index
+
+# ============================== Low I/O Priority ==============================
+IOPRIO_CLASS_IDLE = 3
+IOPRIO_CLASS_SHIFT = 13
+IOPRIO_WHO_PROCESS = 1
+SYS_IOPRIO_SET = {"x86_64": 251, "aarch64": 30, "arm64": 30}
+
+def lower_io_priority():
+    """Best effort: puts the calling thread in the idle I/O class and lowest CPU priority (Linux only)."""
+    if not hasattr(os, "setpriority"):
+        return
+    tid = threading.get_native_id()
+    try:
+        os.setpriority(os.PRIO_PROCESS, tid, 19)  # per-thread on Linux
+    except OSError:
+        pass
+
+    syscall_nr = SYS_IOPRIO_SET.get(platform.machine())
+    if platform.system() != "Linux" or syscall_nr is None:
+        return
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        libc.syscall(syscall_nr, IOPRIO_WHO_PROCESS, tid, IOPRIO_CLASS_IDLE << IOPRIO_CLASS_SHIFT)
+    except Exception:
+        pass
+
+# ============================== Retention Sweeper ==============================
+class RetentionSweeper:
+    """
+    Periodically trims web_data directories to their age and size budgets,
+    evicting oldest files first. Files that are leased (e.g. a report being
+    downloaded) or newer than `grace` seconds are never removed. Each pass
+    also calls `prune()` on the given SQLite-backed `stores`.
+    """
+    def __init__(self, policies=RETENTION_POLICIES, interval=SWEEP_INTERVAL, grace=SWEEP_GRACE, stores=()):
+        self.policies = policies
+        self.stores = stores
+        self.interval = interval
+        self.grace = grace
+        self._leases = defaultdict(int)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.stats = {
+            "runs": 0,
+            "last_run": None,
+            "last_duration": 0.0,
+            "reclaimed_bytes": 0,
+            "reclaimed_files": 0,
+            "errors": 0,
+            "pruned_rows": 0,
+            "directories": {name: {"reclaimed_bytes": 0, "reclaimed_files": 0, "current_bytes": 0, "current_files": 0}
+                            for name in policies}
+        }
+
+    # ----------------------- Leases (protect files in use) -----------------------
+    def acquire(self, path):
+        """
+        Leases `path` in this process. Sweepers in other workers can't see the
+        lease, so the file is also touched: a fresh mtime puts it inside their grace period.
+        """
+        with self._lock:
+            self._leases[os.path.abspath(path)] += 1
+        try:
+            os.utime(path)
+        except OSError:
+            pass  # missing file: the caller answers 404
+
+    def release(self, path):
+        key = os.path.abspath(path)
+        with self._lock:
+            self._leases[key] -= 1
+            if self._leases[key] <= 0:
+                del self._leases[key]
+
+    def is_leased(self, path):
+        with self._lock:
+            return os.path.abspath(path) in self._leases
+
+    # ----------------------------- Sweeping ------------------------------
+    def _remove(self, path, size, dir_stats):
+        # Check-and-delete under the lease lock so a download can't start in between
+        with self._lock:
+            if os.path.abspath(path) in self._leases:
+                return False
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                return False
+            except OSError as e:
+                print(f"Sweeper Error: could not remove {path}: {e}")
+                self.stats["errors"] += 1
+                return False
+        dir_stats["reclaimed_bytes"] += size
+        dir_stats["reclaimed_files"] += 1
+        self.stats["reclaimed_bytes"] += size
+        self.stats["reclaimed_files"] += 1
+        return True
+
+    def sweep_directory(self, name, directory, max_age=0, max_bytes=0, now=None):
+        """Applies one directory's budgets; stats are kept under its logical `name`. Returns bytes reclaimed."""
+        now = now or time.time()
+        dir_stats = self.stats["directories"].setdefault(
+            name, {"reclaimed_bytes": 0, "reclaimed_files": 0, "current_bytes": 0, "current_files": 0})
+        before = dir_stats["reclaimed_bytes"]
+
+        entries = []
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_file(follow_symlinks=False):
+                        st = entry.stat(follow_symlinks=False)
+                        entries.append((st.st_mtime, st.st_size, entry.path))
+        except FileNotFoundError:
+            return 0
+        entries.sort()  # oldest first
+
+        total = sum(size for _, size, _ in entries)
+        kept = []
+        for mtime, size, path in entries:
+            age = now - mtime
+            if max_age and age > max_age and age > self.grace and self._remove(path, size, dir_stats):
+                total -= size
+            else:
+                kept.append((mtime, size, path))
+
+        # Size budget: keep evicting oldest until under the limit
+        remaining = len(kept)
+        if max_bytes and total > max_bytes:
+            for mtime, size, path in kept:
+                if total <= max_bytes:
+                    break
+                if now - mtime > self.grace and self._remove(path, size, dir_stats):
+                    total -= size
+                    remaining -= 1
+
+        dir_stats["current_bytes"] = total
+        dir_stats["current_files"] = remaining
+        return dir_stats["reclaimed_bytes"] - before
+
+    def sweep(self):
+        """Runs one pass over every configured directory. Returns total bytes reclaimed."""
+        start = time.perf_counter()
+        now = time.time()
+        reclaimed = 0
+        for name, policy in self.policies.items():
+            try:
+                reclaimed += self.sweep_directory(name, policy["path"], policy.get("max_age", 0),
+                                                  policy.get("max_bytes", 0), now)
+            except Exception as e:
+                print(f"Sweeper Error ({name}): {e}")
+                self.stats["errors"] += 1
+        for store in self.stores:
+            try:
+                self.stats["pruned_rows"] += store.prune(now)
+            except Exception as e:
+                print(f"Sweeper Error ({type(store).__name__}): {e}")
+                self.stats["errors"] += 1
+        self.stats["runs"] += 1
+        self.stats["last_run"] = now
+        self.stats["last_duration"] = round(time.perf_counter() - start, 3)
+        if reclaimed:
+            print(f"Sweeper reclaimed {reclaimed} bytes")
+        return reclaimed
+
+    # ----------------------------- Background -----------------------------
+    def _run(self):
+        lower_io_priority()
+        while not self._stop.is_set():
+            self.sweep()
+            self._stop.wait(self.interval)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="retention-sweeper", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def metrics(self):
+        with self._lock:
+            leased = len(self._leases)
+        return {**self.stats, "leased_files": leased}
+
+sweeper = RetentionSweeper(stores=[affinity_index])
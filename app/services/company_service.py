@@ -0,0 +1,147 @@
+import os
+import threading
+import time
+
+from app.config import COMPANIES_FILE, COMPANIES_SNAPSHOT, COMPANIES_RELOAD_INTERVAL, COMPANIES_MMAP
+from app.services.dataset_service import check_ids, load_companies, open_snapshot
+from app.services.matching_service import compile_matcher
+
+# ================================ Company Snapshot ================================
+class CompanySnapshot:
+    """
+    Immutable view of the company dataset plus its precompiled matchers.
+    Behaves like the plain list it replaces (len / iteration / indexing).
+    """
+    def __init__(self, companies, matchers, version=0):
+        self.companies = companies
+        self.matchers = matchers  # company id -> CompanyMatcher
+        self.by_id = {c.get('id'): c for c in companies}
+        self.version = version
+
+    def __len__(self):
+        return len(self.companies)
+
+    def __iter__(self):
+        return iter(self.companies)
+
+    def __getitem__(self, index):
+        return self.companies[index]
+
+def build_snapshot(companies, previous=None):
+    """
+    Builds a new snapshot, reusing the dict and matcher of every company whose
+    entry is unchanged (by `id`) in `previous`. Returns (snapshot, changes).
+    Raises ValueError if ids are missing or duplicated.
+    """
+    check_ids(companies)
+    old_by_id = previous.by_id if previous else {}
+    old_matchers = previous.matchers if previous else {}
+
+    merged, matchers = [], {}
+    changes = {"added": [], "updated": [], "removed": []}
+    for company in companies:
+        cid = company.get('id')
+        old = old_by_id.get(cid)
+        if old is not None and old == company:
+            merged.append(old)
+            matchers[cid] = old_matchers[cid]
+            continue
+        changes["added" if old is None else "updated"].append(cid)
+        merged.append(company)
+        matchers[cid] = compile_matcher(company)
+
+    new_ids = set(matchers)
+    changes["removed"] = [cid for cid in old_by_id if cid not in new_ids]
+    version = previous.version + 1 if previous else 0
+    return CompanySnapshot(merged, matchers, version), changes
+
+# ================================ Hot Reload Watcher ================================
+class CompanyIndex:
+    """
+    Holds the current CompanySnapshot and polls companies.json for changes.
+    Readers call `snapshot()` once per request; reloads build a complete new
+    snapshot off to the side and swap the reference in a single assignment.
+    With `mapped=True` the snapshot is a shared MappedCompanies view instead.
+    """
+    def __init__(self, path=COMPANIES_FILE, interval=COMPANIES_RELOAD_INTERVAL,
+                 mapped=COMPANIES_MMAP, snapshot_path=COMPANIES_SNAPSHOT):
+        self.path = path
+        self.interval = interval
+        self.mapped = mapped
+        self.snapshot_path = snapshot_path
+        self._signature = self._stat()
+        if mapped:
+            self._snapshot = open_snapshot(path, snapshot_path)
+        else:
+            try:
+                self._snapshot, _ = build_snapshot(load_companies(path) or [])
+            except ValueError as e:
+                print(f"Error: Invalid companies file {path}: {e}")
+                self._snapshot, _ = build_snapshot([])
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def snapshot(self):
+        return self._snapshot
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+            return (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            return None
+
+    def reload(self, force=False):
+        """Reloads the dataset if the file changed. Returns the change summary, or None."""
+        with self._reload_lock:
+            signature = self._stat()
+            if signature is None or (signature == self._signature and not force):
+                return None
+
+            # Mapped mode: another worker may already have recompiled the shared file
+            if self.mapped:
+                self._signature = signature  # a bad file is reported once, not on every tick
+                self._snapshot = open_snapshot(self.path, self.snapshot_path)  # atomic swap
+                print(f"Companies snapshot remapped: {len(self._snapshot)} rows")
+                return {"rows": len(self._snapshot)}
+
+            companies = load_companies(self.path)
+            if companies is None:
+                return None
+
+            start = time.perf_counter()
+            try:
+                snapshot, changes = build_snapshot(companies, previous=self._snapshot)
+            except ValueError as e:
+                # Keep serving the current snapshot until the file is fixed
+                print(f"Error: Invalid companies file {self.path}: {e}")
+                self._signature = signature
+                return None
+            self._snapshot = snapshot  # atomic swap
+            self._signature = signature
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"Companies reloaded (v{snapshot.version}): "
+                  f"+{len(changes['added'])} ~{len(changes['updated'])} -{len(changes['removed'])} in {elapsed:.1f} ms")
+            return changes
+
+    # ----------------------------- Background -----------------------------
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.reload()
+            except Exception as e:
+                print(f"Companies Reload Error: {e}")
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="companies-watcher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+company_index = CompanyIndex()
@@ -0,0 +1,247 @@
+import json
+import mmap
+import numbers
+import os
+import struct
+
+from app.config import COMPANIES_FILE, COMPANIES_SNAPSHOT
+
+# ================================ Binary Snapshot Format ================================
+# [header][rows: fixed-width columns][skill refs][string table]
+# Strings are UTF-8 and referenced as (offset, length) into the string table.
+# Matching columns (role, location, work_mode, skills) are stored lowercased;
+# the original JSON of each company is kept so the top results decode exactly.
+MAGIC = b"PLCY"
+FORMAT_VERSION = 2
+
+HEADER = struct.Struct("<4sIIIQQQQ")            # magic, version, rows, skills, rows_off, skills_off, strings_off, size
+ROW = struct.Struct("<qdB3xIIIIIIIIII")         # id, ctc, flags, role, location, work_mode, record, skills_start/count
+SKILL = struct.Struct("<II")                    # offset, length
+
+HAS_CTC = 1
+HAS_WORK_MODE = 2
+
+# ================================ Source Loader ================================
+def check_ids(companies):
+    """Matchers and the reload diff are keyed by `id`: every company needs a unique one."""
+    if not isinstance(companies, list):
+        raise ValueError(f"expected a list of companies, got {type(companies).__name__}")
+    seen = set()
+    for row, company in enumerate(companies):
+        if not isinstance(company, dict):
+            raise ValueError(f"company at row {row} is not an object")
+        cid = company.get('id')
+        if cid is None:
+            raise ValueError(f"company at row {row} has no id")
+        if not isinstance(cid, (int, str)) or isinstance(cid, bool):
+            raise ValueError(f"company id {cid!r} at row {row} is not an integer or string")
+        if cid in seen:
+            raise ValueError(f"duplicate company id {cid!r} at row {row}")
+        seen.add(cid)
+
+def load_companies(path=COMPANIES_FILE):
+    """Reads the companies JSON. Returns None (after logging why) if it is missing or unparsable."""
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        print(f"Error: Companies file not found at {path}")
+    except json.JSONDecodeError as e:
+        # Likely a partial write; callers keep serving what they have
+        print(f"Error: Could not parse {path}: {e}")
+    return None
+
+class StringTable:
+    """Deduplicating UTF-8 string table builder."""
+    def __init__(self):
+        self.chunks = []
+        self.size = 0
+        self.index = {}
+
+    def add(self, text):
+        if text in self.index:
+            return self.index[text]
+        data = text.encode("utf-8")
+        ref = (self.size, len(data))
+        self.chunks.append(data)
+        self.size += len(data)
+        self.index[text] = ref
+        return ref
+
+def compile_snapshot(companies, output_path=COMPANIES_SNAPSHOT):
+    """
+    Writes `companies` (list of dicts) as a binary snapshot. The file is replaced atomically.
+    Raises ValueError if ids are missing, duplicated or not 64-bit integers.
+    """
+    check_ids(companies)
+    for company in companies:
+        if not isinstance(company['id'], int) or not -2**63 <= company['id'] < 2**63:
+            raise ValueError(f"company id {company['id']!r} is not an integer (required by the snapshot)")
+
+    strings = StringTable()
+    rows, skill_refs = [], []
+
+    for company in companies:
+        ctc = company.get('ctc')
+        mode = company.get('work_mode')
+        flags = 0
+        if isinstance(ctc, numbers.Real) and not isinstance(ctc, bool):
+            flags |= HAS_CTC
+        else:
+            ctc = 0
+        if isinstance(mode, str):
+            flags |= HAS_WORK_MODE
+        else:
+            mode = ""
+
+        skills_start = len(skill_refs)
+        for skill in company.get('skills', []):
+            skill_refs.append(strings.add(skill.lower()))
+
+        rows.append(ROW.pack(
+            company['id'], float(ctc), flags,
+            *strings.add(company.get('role', '').lower()),
+            *strings.add(company.get('location', '').lower()),
+            *strings.add(mode.lower()),
+            *strings.add(json.dumps(company, ensure_ascii=False)),
+            skills_start, len(skill_refs) - skills_start
+        ))
+
+    rows_off = HEADER.size
+    skills_off = rows_off + ROW.size * len(rows)
+    strings_off = skills_off + SKILL.size * len(skill_refs)
+
+    size = strings_off + strings.size
+
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(rows), len(skill_refs), rows_off, skills_off, strings_off, size))
+        f.writelines(rows)
+        f.writelines(SKILL.pack(*ref) for ref in skill_refs)
+        f.writelines(strings.chunks)
+    os.replace(tmp_path, output_path)
+    return output_path
+
+# ================================ Read-only Mapped View ================================
+class MappedCompanies:
+    """
+    Read-only, mmap-backed view of a compiled snapshot. Pages are shared
+    between every worker that maps the same file; nothing is parsed up front.
+    Raises ValueError if the file is empty, truncated or from another format version.
+    """
+    def __init__(self, path=COMPANIES_SNAPSHOT):
+        self.path = path
+        with open(path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)  # ValueError if empty
+        try:
+            self._check_layout()
+        except ValueError:
+            self.mm.close()
+            raise
+
+    def _check_layout(self):
+        if len(self.mm) < HEADER.size:
+            raise ValueError(f"Truncated company snapshot: {self.path}")
+        magic, version, self.count, self.skill_count, self.rows_off, self.skills_off, self.strings_off, size = \
+            HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported company snapshot: {self.path}")
+        if (size != len(self.mm) or self.skills_off != self.rows_off + self.count * ROW.size
+                or self.strings_off != self.skills_off + self.skill_count * SKILL.size or self.strings_off > size):
+            raise ValueError(f"Truncated company snapshot: {self.path}")
+
+    def __len__(self):
+        return self.count
+
+    def _row(self, row):
+        return ROW.unpack_from(self.mm, self.rows_off + row * ROW.size)
+
+    def _str(self, offset, length):
+        start = self.strings_off + offset
+        return self.mm[start:start + length].decode("utf-8")
+
+    def filter_fields(self, row):
+        """(location, ctc or None, work_mode or None) for the hard filters."""
+        _, ctc, flags, _, _, loc_off, loc_len, mode_off, mode_len, *_ = self._row(row)
+        return (
+            self._str(loc_off, loc_len),
+            ctc if flags & HAS_CTC else None,
+            self._str(mode_off, mode_len) if flags & HAS_WORK_MODE else None
+        )
+
+    def match_fields(self, row):
+        """(role, [skills]) lowercased, for scoring."""
+        fields = self._row(row)
+        role = self._str(fields[3], fields[4])
+        skills_start, skills_count = fields[11], fields[12]
+        base = self.skills_off + skills_start * SKILL.size
+        skills = [self._str(*SKILL.unpack_from(self.mm, base + i * SKILL.size)) for i in range(skills_count)]
+        return role, skills
+
+    def decode(self, row):
+        """Materializes one company dict (used only for the final candidates)."""
+        fields = self._row(row)
+        return json.loads(self._str(fields[9], fields[10]))
+
+    def __iter__(self):
+        for row in range(self.count):
+            yield self.decode(row)
+
+    def __getitem__(self, row):
+        if row < 0:
+            row += self.count
+        if not 0 <= row < self.count:
+            raise IndexError(row)
+        return self.decode(row)
+
+def _map_existing(path):
+    """MappedCompanies for `path`, or None if it is missing or unusable (logged)."""
+    try:
+        return MappedCompanies(path)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Error: Could not map {path}: {e}")
+        return None
+
+def open_snapshot(source=COMPANIES_FILE, path=COMPANIES_SNAPSHOT, companies=None):
+    """
+    Maps the compiled snapshot, (re)compiling it first if it is missing, unusable
+    or older than `source`. If `source` can't be used either, the last usable
+    snapshot is served, else an empty one.
+    """
+    try:
+        source_mtime = os.stat(source).st_mtime_ns
+    except FileNotFoundError:
+        source_mtime = 0  # Serve an existing snapshot even without the JSON source
+    try:
+        fresh = os.stat(path).st_mtime_ns >= source_mtime
+    except FileNotFoundError:
+        fresh = False
+    if fresh:
+        mapped = _map_existing(path)
+        if mapped is not None:
+            return mapped
+
+    if companies is None:
+        companies = load_companies(source)
+    if companies is not None:
+        try:
+            compile_snapshot(companies, path)
+            print(f"Compiled company snapshot: {path}")
+            return MappedCompanies(path)
+        except ValueError as e:
+            # Keep serving the current snapshot until the file is fixed
+            print(f"Error: Invalid companies file {source}: {e}")
+
+    mapped = None if fresh else _map_existing(path)
+    if mapped is not None:
+        return mapped
+    compile_snapshot([], path)
+    os.utime(path, ns=(0, 0))  # Placeholder: any source counts as newer
+    return MappedCompanies(path)
+
+if __name__ == "__main__":
+    data = load_companies()
+    if data is not None:
+        print(f"Wrote {len(data)} companies to {compile_snapshot(data)}")
@@ -1,14 +1,102 @@
 import re
+from collections import namedtuple
+from functools import lru_cache
+
+#======================== Precompiled company matchers ========================
+CompanyMatcher = namedtuple("CompanyMatcher", ["role", "skills"])
+
+@lru_cache(maxsize=4096)
+def word_pattern(text):
+    """Word-boundary pattern for an already-lowercased role/skill (cached per process)."""
+    return re.compile(rf'\b{re.escape(text)}\b', re.IGNORECASE)
+
+def compile_matcher(company):
+    """Precompiles the role and skill word-boundary patterns for one company."""
+    company_role = company.get('role', '').lower()
+    role_pattern = word_pattern(company_role) if company_role else None
+    skill_patterns = [word_pattern(s.lower()) for s in company.get('skills', [])]
+    return CompanyMatcher(role_pattern, skill_patterns)
+
+#======================== Hard filters ========================
+def parse_preferences(user_preferences):
+    """Normalizes user preferences once per request. Returns None when there are none."""
+    if not user_preferences:
+        return None
+
+    # Parse user CTC range (e.g., "3-5 LPA", "8-12 LPA"); ignore parsing errors
+    ctc_pref = user_preferences.get('ctc_range', '')
+    ctc_bounds = None
+    if ctc_pref and '-' in ctc_pref:
+        try:
+            min_ctc, max_ctc = ctc_pref.split('-')
+            ctc_bounds = (int(min_ctc.strip().split()[0]), int(max_ctc.strip().split()[0]))  # Extract numbers
+        except:
+            pass
+
+    return {
+        'location': user_preferences.get('location', '').lower(),
+        'ctc': ctc_bounds,
+        'remote_only': 'remote' in user_preferences.get('work_environment', '').lower()
+    }
+
+def passes_filters(prefs, company_location, company_ctc=None, company_mode=None):
+    """
+    Applies the location / CTC / work-mode hard filters to one company.
+    `company_location` and `company_mode` are lowercased; `company_ctc` and
+    `company_mode` are None when the company doesn't list them.
+    """
+    # ----- Filter by location ----- 
+    location_pref = prefs['location']
+    if location_pref:
+        # If user wants "Remote"
+        if 'remote' in location_pref:
+            if 'remote' not in company_location:
+                return False  # Skip non-remote if user wants remote
+        # If user wants specific city
+        elif 'indore' in location_pref:
+            if 'indore' not in company_location and 'remote' not in company_location:
+                return False
+        elif 'bhopal' in location_pref:
+            if 'bhopal' not in company_location and 'remote' not in company_location:
+                return False
+        # "Anywhere in Central India" - allow Indore, Bhopal, Remote
+
+    # ----- Filter by CTC ----- 
+    if prefs['ctc'] and company_ctc is not None:
+        min_ctc, max_ctc = prefs['ctc']
+        try:
+            if company_ctc < min_ctc or company_ctc > max_ctc:
+                return False  # Skip if outside range
+        except TypeError:
+            pass  # Non-numeric CTC in dataset
+
+    # ----- Filter by work environment ----- 
+    if prefs['remote_only'] and company_mode is not None:
+        if 'remote' not in company_mode:
+            return False
+
+    return True
+
+#======================== Scoring from match bits ========================
+def affinity_score(mask):
+    """Score for a match bitmask: bit 0 = role (+10), bit i+1 = skill i (+1 each)."""
+    return (10 if mask & 1 else 0) + bin(mask >> 1).count("1")
+
+def _company_mode(company):
+    mode = company.get('work_mode')
+    return mode.lower() if isinstance(mode, str) else None
 
 #======================== Function to rank companies ========================
-def rank_companies(user_profile_text, companies, user_preferences=None):
+def rank_companies(user_profile_text, companies, user_preferences=None, affinity=None):
     """
     Ranks companies based on user profile with strict matching and filtering.
     
     Args:
         user_profile_text: Combined text (answers + resume)
-        companies: List of company dicts
+        companies: List of company dicts, or a CompanySnapshot (uses its precompiled matchers)
         user_preferences: Dict with 'location', 'ctc_range', 'work_environment'
+        affinity: Optional precomputed {row: match bitmask} for this profile (see affinity_service);
+                  replaces the regex scan when given
     
     Returns:
         Top 5 companies
@@ -18,87 +106,47 @@ def rank_companies(user_profile_text, companies, user_preferences=None):
     # Normalize user profile
     profile_lower = user_profile_text.lower()
     
-    # ------------------------ PHASE 1: HARD FILTERING ------------------------
-    filtered_companies = []
-    
-    if user_preferences: # Based on user preferences
-        location_pref = user_preferences.get('location', '').lower()
-        ctc_pref = user_preferences.get('ctc_range', '')
-        work_env_pref = user_preferences.get('work_environment', '').lower()
-        
-        for company in companies:
-
-            # ----- Filter by location ----- 
-            if location_pref:
-                company_location = company.get('location', '').lower()
-                
-                # If user wants "Remote"
-                if 'remote' in location_pref:
-                    if 'remote' not in company_location:
-                        continue  # Skip non-remote if user wants remote
-                # If user wants specific city
-                elif 'indore' in location_pref:
-                    if 'indore' not in company_location and 'remote' not in company_location:
-                        continue
-                elif 'bhopal' in location_pref:
-                    if 'bhopal' not in company_location and 'remote' not in company_location:
-                        continue
-                # "Anywhere in Central India" - allow Indore, Bhopal, Remote
-                elif 'central india' in location_pref or 'anywhere' in location_pref:
-                    pass  # Include all
-            
-            # ----- Filter by CTC ----- 
-            if ctc_pref and 'ctc' in company:
-                # Parse user CTC range (e.g., "3-5 LPA", "8-12 LPA")
-                if '-' in ctc_pref:
-                    try:
-                        min_ctc, max_ctc = ctc_pref.split('-')
-                        min_ctc = int(min_ctc.strip().split()[0])  # Extract number
-                        max_ctc = int(max_ctc.strip().split()[0])
-                        
-                        company_ctc = company.get('ctc', 0)
-                        if company_ctc < min_ctc or company_ctc > max_ctc:
-                            continue  # Skip if outside range
-                    except:
-                        pass  # Ignore parsing errors
-            
-            # ----- Filter by work environment ----- 
-            if work_env_pref and 'work_mode' in company:
-                company_mode = company.get('work_mode', '').lower()
-                if 'remote' in work_env_pref and 'remote' not in company_mode:
-                    continue
-            
-            # Append company to filtered list
-            filtered_companies.append(company)
+    # Memory-mapped dataset: filter and score on raw columns, decode only the top 5
+    prefs = parse_preferences(user_preferences)
+    if hasattr(companies, 'decode'):
+        return _rank_mapped(profile_lower, companies, prefs, affinity)
 
+    # ------------------------ PHASE 1: HARD FILTERING ------------------------
+    if prefs: # Based on user preferences
+        filtered_companies = [
+            (row, company) for row, company in enumerate(companies)
+            if passes_filters(prefs, company.get('location', '').lower(), company.get('ctc'), _company_mode(company))
+        ]
     else:
         # No preferences, use all companies
-        filtered_companies = companies
+        filtered_companies = list(enumerate(companies))
     
     print(f"After filtering: {len(filtered_companies)} companies remain")
     
     # ------------------------ PHASE 2: SCORING ------------------------
     scored_companies = []
+    matchers = getattr(companies, 'matchers', None) or {}
     
-    for company in filtered_companies:
+    for row, company in filtered_companies:
+        # Cached match bits for this profile: no regex needed
+        if affinity is not None:
+            scored_companies.append((affinity_score(affinity.get(row, 0)), company))
+            continue
+
         score = 0
         
-        # Normalize company data
-        company_skills = [s.lower() for s in company.get('skills', [])]
-        company_role = company.get('role', '').lower()
+        # Precompiled patterns from the snapshot (compiled on the fly for plain lists)
+        matcher = matchers.get(company.get('id')) or compile_matcher(company)
         
         # 1. Role Match (HIGH PRIORITY: +10 points)
         # Use regex word boundary to avoid partial matches
-        if company_role:
-            pattern = rf'\b{re.escape(company_role)}\b'
-            if re.search(pattern, profile_lower, re.IGNORECASE):
-                score += 10
+        if matcher.role and matcher.role.search(profile_lower):
+            score += 10
         
         # 2. Skill Match (LOW PRIORITY: +1 point each)
-        for skill in company_skills:
-            # Use word boundary to prevent "Java" matching "JavaScript"
-            pattern = rf'\b{re.escape(skill)}\b'
-            if re.search(pattern, profile_lower, re.IGNORECASE):
+        # Use word boundary to prevent "Java" matching "JavaScript"
+        for pattern in matcher.skills:
+            if pattern.search(profile_lower):
                 score += 1
         
         # Append company with score
@@ -112,3 +160,34 @@ def rank_companies(user_profile_text, companies, user_preferences=None):
     print(f"Top 5 companies names: {[s[1]['name'] for s in scored_companies[:5]]}")
     
     return [c[1] for c in scored_companies[:5]]
+
+#======================== Ranking over a memory-mapped dataset ========================
+def _rank_mapped(profile_lower, companies, prefs, affinity=None):
+    """Same filters and scoring as rank_companies, over MappedCompanies rows (no dicts until the top 5)."""
+    scored_rows = []
+    for row in range(len(companies)):
+        if prefs and not passes_filters(prefs, *companies.filter_fields(row)):
+            continue
+
+        if affinity is not None:
+            scored_rows.append((affinity_score(affinity.get(row, 0)), row))
+            continue
+
+        score = 0
+        role, skills = companies.match_fields(row)
+        if role and word_pattern(role).search(profile_lower):
+            score += 10
+        for skill in skills:
+            if word_pattern(skill).search(profile_lower):
+                score += 1
+        scored_rows.append((score, row))
+
+    print(f"After filtering: {len(scored_rows)} companies remain")
+
+    scored_rows.sort(key=lambda x: x[0], reverse=True)
+    top = [companies.decode(row) for _, row in scored_rows[:5]]
+
+    print(f"Top 5 scores: {[s[0] for s in scored_rows[:5]]}")
+    print(f"Top 5 companies names: {[c['name'] for c in top]}")
+
+    return top
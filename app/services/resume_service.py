@@ -1,21 +1,89 @@
 import os
-import pypdf
+import sys
+import threading
+import multiprocessing
+from contextlib import contextmanager
 
-from app.config import RESUME_DIR
+from app.config import RESUME_DIR, RESUME_CHAR_BUDGET, RESUME_PARSE_TIMEOUT, RESUME_PARSE_WORKERS
+from app.resume_parser import read_pdf_text
+
+# ============================= Resume Parsing Pool =============================
+# PDF parsing is CPU-bound and holds the GIL, so it runs in separate processes;
+# extract_resume_text blocks its (threadpool) caller until the result is in.
+# Workers are forked from a forkserver that has only app.resume_parser preloaded,
+# so they don't inherit the server's threads or open connections. Windows has no
+# forkserver and falls back to "spawn", where each worker re-imports __main__.
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+_pool = None
+_pool_lock = threading.Lock()
+
+@contextmanager
+def _main_module_hidden():
+    """
+    Workers normally re-import the launching script as __mp_main__, which for
+    `python main.py` would rebuild the whole app in every worker. The task only
+    needs app.resume_parser, so the script is hidden while the workers start.
+    """
+    main = sys.modules["__main__"]
+    saved = {attr: main.__dict__.pop(attr) for attr in ("__file__", "__spec__") if attr in main.__dict__}
+    main.__spec__ = None
+    try:
+        yield
+    finally:
+        main.__dict__.pop("__spec__", None)
+        main.__dict__.update(saved)
+
+def _create_pool():
+    ctx = multiprocessing.get_context(START_METHOD)
+    if START_METHOD != "forkserver":
+        return ctx.Pool(RESUME_PARSE_WORKERS)
+    ctx.set_forkserver_preload(["app.resume_parser"])
+    with _main_module_hidden():
+        return ctx.Pool(RESUME_PARSE_WORKERS)
+
+# Function to start the pool; called once from the app lifespan, before requests are served.
+# Note: a worker that Pool itself respawns later (after a crash / OOM kill) starts outside
+# _main_module_hidden and re-imports the launching script. That is harmless under
+# `uvicorn main:app` (uvicorn's own __main__ is guarded) but rebuilds the app once
+# per respawned worker under `python main.py`.
+def start_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = _create_pool()
+        return _pool
+
+def stop_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.terminate()
+            _pool = None
+
+# Function to kill the pool (the only way to stop a stuck parse) and start a fresh one
+def _restart_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.terminate()
+        _pool = _create_pool()
 
 # ============================= Function to extract resume text =============================
-def extract_resume_text(filename):
+def extract_resume_text(filename, max_chars=RESUME_CHAR_BUDGET, timeout=RESUME_PARSE_TIMEOUT):
     path = os.path.join(RESUME_DIR, filename)
     text = ""
     try:
         if not os.path.exists(path): return ""
         if filename.endswith('.pdf'):
-            reader = pypdf.PdfReader(path)
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
+            result = start_pool().apply_async(read_pdf_text, (path, max_chars))  # no-op once started
+            text = result.get(timeout)
         else:
             # Fallback for text/other files if supported later
             pass
+    except multiprocessing.TimeoutError:
+        print(f"Error reading resume: parsing exceeded {timeout}s, aborted")
+        _restart_pool()
     except Exception as e:
         print(f"Error reading resume: {e}")
     return text
@@ -0,0 +1,189 @@
+import atexit
+import json
+import queue
+import sqlite3
+import threading
+import time
+
+from app.config import ASSESSMENT_DB
+
+# ================================ Schema =================================
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS assessments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    mode TEXT NOT NULL,
+    provider TEXT,
+    resume_used INTEGER NOT NULL DEFAULT 0,
+    answers TEXT NOT NULL,
+    timings TEXT NOT NULL,
+    response TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_assessments_created_at ON assessments(created_at);
+CREATE INDEX IF NOT EXISTS idx_assessments_mode ON assessments(mode, created_at);
+CREATE INDEX IF NOT EXISTS idx_assessments_provider ON assessments(provider, created_at);
+"""
+
+COLUMNS = ("id", "created_at", "mode", "provider", "resume_used", "answers", "timings", "response")
+JSON_COLUMNS = ("answers", "timings", "response")
+
+def connect(db_path=ASSESSMENT_DB):
+    """Opens a connection in WAL mode so readers never block the writer."""
+    conn = sqlite3.connect(str(db_path), timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+# =========================== Batched Background Writer ===========================
+class AssessmentStore:
+    """
+    Queues assessment records and writes them to SQLite from a single
+    background thread, in batches of up to `batch_size` rows per transaction.
+    While the database can't be opened the writer retries with backoff; at most
+    `max_queued` records wait in memory, newer ones are dropped (and counted).
+    """
+    def __init__(self, db_path=ASSESSMENT_DB, batch_size=50, flush_interval=1.0,
+                 max_queued=10000, retry_delay=1.0, max_retry_delay=60.0):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.queue = queue.Queue(maxsize=max_queued)
+        self.dropped = 0
+        self._thread = None
+        self._lock = threading.Lock()
+
+    # Function to start the writer thread on first use
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="assessment-writer", daemon=True)
+                self._thread.start()
+
+    # Function to queue a record (never touches the disk on the caller's thread)
+    def record(self, mode, answers, provider, timings, response, resume_used=False):
+        self._ensure_started()
+        try:
+            self.queue.put_nowait((
+                time.time(),
+                mode,
+                provider,
+                int(bool(resume_used)),
+                json.dumps(answers),
+                json.dumps(timings),
+                json.dumps(response),
+            ))
+        except queue.Full:
+            self.dropped += 1
+            print(f"Assessment Store Error: queue full, dropped record ({self.dropped} dropped so far)")
+
+    # Function to block until everything queued so far is committed (or `timeout` seconds pass)
+    def flush(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    print(f"Assessment Store Error: {self.queue.unfinished_tasks} records not written")
+                    return False
+                self.queue.all_tasks_done.wait(remaining)
+        return True
+
+    # Function to open the database, retrying with backoff (read-only dir, locked or corrupt file)
+    def _connect(self):
+        delay = self.retry_delay
+        while True:
+            try:
+                return connect(self.db_path)
+            except (sqlite3.Error, OSError) as e:
+                print(f"Assessment Store Error: {e} (retrying in {delay:.1f}s)")
+                time.sleep(delay)
+                delay = min(delay * 2, self.max_retry_delay)
+
+    # Writer loop: collect a batch, commit it, repeat
+    def _run(self):
+        conn = self._connect()
+        try:
+            while True:
+                batch = [self.queue.get()]
+                deadline = time.monotonic() + self.flush_interval
+                while len(batch) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(self.queue.get(timeout=remaining))
+                    except queue.Empty:
+                        break
+                try:
+                    with conn:
+                        conn.executemany(
+                            "INSERT INTO assessments (created_at, mode, provider, resume_used, answers, timings, response) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            batch
+                        )
+                except Exception as e:
+                    print(f"Assessment Store Error: {e}")
+                finally:
+                    for _ in batch:
+                        self.queue.task_done()
+        finally:
+            conn.close()
+
+# ================================ Query & Export =================================
+def _row_to_dict(row):
+    item = dict(zip(COLUMNS, row))
+    for key in JSON_COLUMNS:
+        item[key] = json.loads(item[key])
+    item["resume_used"] = bool(item["resume_used"])
+    return item
+
+def query_assessments(mode=None, provider=None, since=None, until=None, limit=None, db_path=ASSESSMENT_DB):
+    """Returns stored assessments (oldest first) matching the given filters."""
+    clauses, params = [], []
+    if mode:
+        clauses.append("mode = ?")
+        params.append(mode)
+    if provider:
+        clauses.append("provider = ?")
+        params.append(provider)
+    if since is not None:
+        clauses.append("created_at >= ?")
+        params.append(since)
+    if until is not None:
+        clauses.append("created_at < ?")
+        params.append(until)
+
+    sql = f"SELECT {', '.join(COLUMNS)} FROM assessments"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += " ORDER BY created_at, id"
+    if limit:
+        sql += " LIMIT ?"
+        params.append(int(limit))
+
+    conn = connect(db_path)
+    try:
+        for row in conn.execute(sql, params):
+            yield _row_to_dict(row)
+    finally:
+        conn.close()
+
+def export_jsonl(output_path, db_path=ASSESSMENT_DB, **filters):
+    """Writes matching assessments to `output_path`, one JSON object per line. Returns row count."""
+    count = 0
+    with open(output_path, "w", encoding="utf-8") as f:
+        for item in query_assessments(db_path=db_path, **filters):
+            f.write(json.dumps(item) + "\n")
+            count += 1
+    return count
+
+assessment_store = AssessmentStore()
+atexit.register(assessment_store.flush, 10)
+
+if __name__ == "__main__":
+    import sys
+    target = sys.argv[1] if len(sys.argv) > 1 else "assessments.jsonl"
+    print(f"Exported {export_jsonl(target)} assessments to {target}")
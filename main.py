@@ -1,14 +1,24 @@
 import uvicorn
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
 
-from app.config import STATIC_DIR
 from app.routes import api, views
+from app.services.cleanup_service import sweeper
+from app.services.company_service import company_index
+from app.services.resume_service import start_pool, stop_pool
 
-app = FastAPI()
+# Background jobs (web_data retention sweeper, companies.json hot reload, resume parsing pool)
+@asynccontextmanager
+async def lifespan(app):
+    start_pool()
+    sweeper.start()
+    company_index.start()
+    yield
+    company_index.stop()
+    sweeper.stop()
+    stop_pool()
 
-# Mount Static Files
-app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
+app = FastAPI(lifespan=lifespan)
 
 # Include Routers
 app.include_router(api.router)
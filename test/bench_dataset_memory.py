@@ -0,0 +1,79 @@
+"""
+Per-worker memory: companies.json parsed into dicts vs. the shared mmap snapshot.
+
+Run:  python -m test.bench_dataset_memory [num_companies] [workers]
+Each "worker" is a separate process that loads the dataset and ranks once.
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+PROFILE = "Python Django React SQL data analyst web developer machine learning"
+PREFS = {"location": "Anywhere in Central India", "ctc_range": "", "work_environment": ""}
+
+def synthetic_dataset(size):
+    with open(BASE_DIR / "company_dataset" / "companies.json") as f:
+        base = json.load(f)
+    return [{**base[i % len(base)], "id": i + 1} for i in range(size)]
+
+def memory_kb():
+    """(rss, private, shared) in kB from /proc (Linux only)."""
+    stats = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[1].isdigit():
+                stats[parts[0].rstrip(":")] = int(parts[1])
+    private = stats.get("Private_Clean", 0) + stats.get("Private_Dirty", 0)
+    shared = stats.get("Shared_Clean", 0) + stats.get("Shared_Dirty", 0)
+    return stats.get("Rss", 0), private, shared
+
+def worker(mode, json_path, bin_path):
+    from app.services.company_service import build_snapshot
+    from app.services.dataset_service import MappedCompanies
+    from app.services.matching_service import rank_companies
+
+    before = memory_kb()
+    if mode == "json":
+        with open(json_path) as f:
+            companies, _ = build_snapshot(json.load(f))
+    else:
+        companies = MappedCompanies(bin_path)
+    rank_companies(PROFILE, companies, PREFS)
+    after = memory_kb()
+    print(json.dumps({"mode": mode, "rss": after[0], "private": after[1], "shared": after[2],
+                      "dataset_private": after[1] - before[1]}))
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    from app.services.dataset_service import compile_snapshot
+
+    tmp = Path(tempfile.mkdtemp())
+    json_path, bin_path = tmp / "companies.json", tmp / "companies.bin"
+    data = synthetic_dataset(size)
+    json_path.write_text(json.dumps(data))
+    compile_snapshot(data, bin_path)
+    print(f"{size} companies: json {os.path.getsize(json_path) // 1024} kB, snapshot {os.path.getsize(bin_path) // 1024} kB")
+
+    for mode in ["json", "mmap"]:
+        procs = [subprocess.Popen([sys.executable, "-m", "test.bench_dataset_memory", "--worker", mode,
+                                   str(json_path), str(bin_path)], cwd=BASE_DIR, stdout=subprocess.PIPE, text=True)
+                 for _ in range(workers)]
+        results = [json.loads(p.communicate()[0].strip().splitlines()[-1]) for p in procs]
+        avg = {k: sum(r[k] for r in results) // workers for k in ("rss", "private", "shared", "dataset_private")}
+        print(f"{mode:>5}: RSS {avg['rss']} kB | private {avg['private']} kB "
+              f"(dataset +{avg['dataset_private']} kB) | shared {avg['shared']} kB  x{workers} workers")
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--worker":
+        worker(*sys.argv[2:5])
+    else:
+        main()
@@ -0,0 +1,72 @@
+"""
+Resume extraction latency and memory: old full-document concat vs. budgeted join, in-process and via the pool.
+
+Run:  python -m test.bench_resume_parsing
+Each variant runs in a fresh process; memory is the peak Python allocation (tracemalloc) in the
+calling process, i.e. what the request path holds (pool parsing happens in the worker).
+"""
+import json
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from test.helpers import make_pdf
+
+REPEATS = 5
+
+def read_full_concat(path):
+    """Pre-change behaviour: every page, `text +=`."""
+    import pypdf
+    text = ""
+    for page in pypdf.PdfReader(path).pages:
+        text += page.extract_text() + "\n"
+    return text
+
+def worker(variant, path):
+    from app.config import RESUME_CHAR_BUDGET
+    from app.resume_parser import read_pdf_text
+
+    if variant == "old":
+        run = lambda: read_full_concat(path)
+    elif variant == "budget":
+        run = lambda: read_pdf_text(path, RESUME_CHAR_BUDGET)
+    else:
+        from app.services import resume_service
+        resume_service.RESUME_DIR = Path(path).parent
+        resume_service.extract_resume_text(Path(path).name)  # warm up the pool
+        run = lambda: resume_service.extract_resume_text(Path(path).name)
+
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        text = run()
+    elapsed = (time.perf_counter() - start) / REPEATS * 1000
+
+    # Separate pass: tracing slows pypdf down a lot, so it is kept out of the timing
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1] // 1024
+    print(json.dumps({"ms": round(elapsed, 1), "peak_kb": peak, "chars": len(text)}))
+
+def main():
+    tmp = Path(tempfile.mkdtemp())
+    for pages in [1, 50]:
+        path = tmp / f"resume_{pages}p.pdf"
+        make_pdf(path, pages)
+        print(f"--- {pages}-page PDF ({path.stat().st_size // 1024} kB)")
+        for variant in ["old", "budget", "pool"]:
+            out = subprocess.run([sys.executable, "-m", "test.bench_resume_parsing", "--worker", variant, str(path)],
+                                 cwd=BASE_DIR, capture_output=True, text=True).stdout
+            result = json.loads(out.strip().splitlines()[-1])
+            print(f"{variant:>7}: {result['ms']:8.1f} ms | peak {result['peak_kb']:6d} kB | {result['chars']} chars")
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--worker":
+        worker(sys.argv[2], sys.argv[3])
+    else:
+        main()
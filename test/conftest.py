@@ -0,0 +1,17 @@
+import copy
+
+import pytest
+
+COMPANIES = [
+    {"id": 1, "name": "A", "role": "Data Analyst", "location": "Indore", "email": "a@x.com",
+     "skills": ["Python", "SQL", "Content"], "ctc": 4},
+    {"id": 2, "name": "B", "role": "Web Developer", "location": "Remote", "email": "b@x.com",
+     "skills": ["React", "JavaScript", "C++"], "work_mode": "Remote"},
+    {"id": 3, "name": "Ç", "role": "Java Developer", "location": "Bhopal", "email": "c@x.com",
+     "skills": ["Java", "Spring"], "ctc": 10},
+]
+
+@pytest.fixture
+def companies():
+    """Small company dataset: filter fields, a non-ASCII name and regex-special skills ("C++")."""
+    return copy.deepcopy(COMPANIES)
@@ -0,0 +1,11 @@
+from fpdf import FPDF
+
+# Function to write a text resume of `pages` pages (shared by the resume parsing tests and benchmark)
+def make_pdf(path, pages):
+    pdf = FPDF()
+    pdf.set_font('Arial', '', 10)
+    for i in range(pages):
+        pdf.add_page()
+        pdf.multi_cell(0, 6, f"Page {i + 1}. " + "Built a Python/Django REST API with React, SQL and AWS deployment. " * 25)
+    pdf.output(str(path))
+    return path
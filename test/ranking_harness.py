@@ -0,0 +1,215 @@
+"""
+Matching-quality and latency regression harness for rank_companies.
+
+Run:  python -m test.ranking_harness [sizes...]        e.g. 100 1000 10000
+      python -m test.ranking_harness --update-golden   (after an intended scoring change)
+
+Profiles are built from QUESTIONS_DB answer combinations plus sample resume
+snippets and go through the same path as run_full_assessment. Companies come
+from a frozen copy of the dataset (test/fixtures/companies.json), so edits to
+company_dataset/companies.json don't invalidate the golden baseline. Every ranking
+engine is checked for top-5 overlap with the golden baseline and for hard
+filter violations (location / CTC / work mode), then timed as the dataset grows.
+"""
+import contextlib
+import io
+import itertools
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from app.models import AssessmentSubmission
+from app.quiz import QUESTIONS_DB
+from app.services.affinity_service import AffinityIndex, RESUME_SEPARATOR
+from app.services.company_service import build_snapshot
+from app.services.dataset_service import MappedCompanies, compile_snapshot
+from app.services.matching_service import rank_companies
+
+GOLDEN_FILE = Path(__file__).resolve().parent / "golden_rankings.json"
+FIXTURE_FILE = Path(__file__).resolve().parent / "fixtures" / "companies.json"
+SEED = 483
+
+RESUME_SNIPPETS = [
+    "",
+    "Skills: Python, Django, REST APIs, PostgreSQL, Docker. Built a web developer portfolio.",
+    "Data Analyst intern. Pandas, NumPy, SQL, Power BI, machine learning, statistics.",
+    "Android developer: Kotlin, Java, Firebase, mobile app development, UI design.",
+    "Network security, penetration testing, vulnerability assessment, Linux, cyber security.",
+    "React, JavaScript, HTML, CSS, Node.js, MongoDB. Frontend developer with Git experience.",
+]
+
+# ================================ Synthetic Data ================================
+def fixture_companies():
+    with open(FIXTURE_FILE) as f:
+        return json.load(f)
+
+def synthetic_companies(size=None, seed=SEED):
+    """
+    Repeats the frozen dataset to `size` rows (default: its own size, the golden
+    dataset) and adds deterministic ctc / work_mode fields.
+    """
+    base = fixture_companies()
+    size = size or len(base)
+    rng = random.Random(seed)
+    companies = []
+    for i in range(size):
+        company = dict(base[i % len(base)], id=i + 1)
+        if rng.random() < 0.8:
+            company["ctc"] = rng.choice([3, 4, 5, 6, 8, 10, 12, 15])
+        if rng.random() < 0.8:
+            company["work_mode"] = rng.choice(["Remote", "Onsite", "Hybrid"])
+        companies.append(company)
+    return companies
+
+def question_options(qid):
+    return next(q["options"] for q in QUESTIONS_DB["detailed"] if q["id"] == qid)
+
+def synthetic_profiles():
+    """One profile per (interest, location, CTC) combination; language, work style and resume rotate."""
+    combos = itertools.product(question_options(1), question_options(3), question_options(4))
+    languages, environments = question_options(2), question_options(26)
+    profiles = []
+    for i, (interest, location, ctc) in enumerate(combos):
+        answers = {
+            "q_1": interest, "q_2": languages[i % len(languages)],
+            "q_3": location, "q_4": ctc, "q_26": environments[i % len(environments)],
+        }
+        submission = AssessmentSubmission(mode="detailed", answers=answers)
+        context = submission.get_formatted_context(QUESTIONS_DB)
+        resume = RESUME_SNIPPETS[i % len(RESUME_SNIPPETS)]
+        resume_section = f"{RESUME_SEPARATOR}{resume}" if resume else ""
+        profiles.append({"id": f"p{i:03d}", "text": context + resume_section, "context": context,
+                         "resume_section": resume_section, "preferences": submission.get_user_preferences()})
+    return profiles
+
+# ================================ Ranking Engines ================================
+def build_engines(companies, workdir):
+    """Every way rank_companies can be driven, keyed by name: (dataset, affinity index or None)."""
+    snapshot, _ = build_snapshot(companies)
+    mapped = MappedCompanies(compile_snapshot(companies, Path(workdir) / "companies.bin"))
+    affinity = AffinityIndex(db_path=Path(workdir) / "affinity.db")
+    return {
+        "list": (companies, None),
+        "snapshot": (snapshot, None),
+        "mmap": (mapped, None),
+        "affinity": (snapshot, affinity),
+        "mmap+aff": (mapped, affinity),
+    }
+
+def rank_quiet(profile, engine):
+    companies, affinity_index = engine if isinstance(engine, tuple) else (engine, None)
+    with contextlib.redirect_stdout(io.StringIO()):
+        affinity = None
+        if affinity_index is not None:
+            affinity = affinity_index.profile_affinity(companies, profile["context"], profile["resume_section"])
+        return rank_companies(profile["text"], companies, profile["preferences"], affinity=affinity)
+
+# ================================ Filter Oracle ================================
+def filter_violations(company, preferences):
+    """Independent restatement of the hard filters; returns the rules `company` breaks."""
+    problems = []
+    location_pref = preferences.get("location", "").lower()
+    company_location = company.get("location", "").lower()
+    if "remote" in location_pref:
+        if "remote" not in company_location:
+            problems.append("location")
+    else:
+        for city in ("indore", "bhopal"):
+            if city in location_pref and city not in company_location and "remote" not in company_location:
+                problems.append("location")
+
+    ctc_pref = preferences.get("ctc_range", "")
+    if "-" in ctc_pref and isinstance(company.get("ctc"), (int, float)):
+        low, high = (int(part.split()[0]) for part in ctc_pref.split("-"))
+        if not low <= company["ctc"] <= high:
+            problems.append("ctc")
+
+    if "remote" in preferences.get("work_environment", "").lower() and isinstance(company.get("work_mode"), str):
+        if "remote" not in company["work_mode"].lower():
+            problems.append("work_mode")
+    return problems
+
+# ================================ Quality Report ================================
+def overlap(expected, actual):
+    if not expected:
+        return 1.0 if not actual else 0.0
+    return len(set(expected) & set(actual)) / len(expected)
+
+def evaluate_quality(engines, profiles, golden):
+    """Per engine: mean top-5 overlap, exact-order matches and filter violations."""
+    report = {}
+    for name, engine in engines.items():
+        overlaps, exact, violations = [], 0, []
+        for profile in profiles:
+            top = rank_quiet(profile, engine)
+            ids = [c["id"] for c in top]
+            expected = golden.get(profile["id"], [])
+            overlaps.append(overlap(expected, ids))
+            exact += ids == expected
+            for company in top:
+                for rule in filter_violations(company, profile["preferences"]):
+                    violations.append((profile["id"], company["id"], rule))
+        report[name] = {
+            "mean_overlap": statistics.mean(overlaps),
+            "min_overlap": min(overlaps),
+            "exact": exact,
+            "profiles": len(profiles),
+            "violations": violations,
+        }
+    return report
+
+def golden_rankings(profiles, companies):
+    return {p["id"]: [c["id"] for c in rank_quiet(p, companies)] for p in profiles}
+
+def load_golden():
+    with open(GOLDEN_FILE) as f:
+        return json.load(f)
+
+# ================================ Latency Report ================================
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def measure_latency(engine, profiles, runs=None):
+    samples = []
+    for profile in profiles[:runs] if runs else profiles:
+        start = time.perf_counter()
+        rank_quiet(profile, engine)
+        samples.append((time.perf_counter() - start) * 1000)
+    return {p: percentile(samples, p) for p in (50, 95, 99)}
+
+def main(argv):
+    profiles = synthetic_profiles()
+    golden_companies = synthetic_companies()
+
+    if "--update-golden" in argv:
+        golden = golden_rankings(profiles, golden_companies)
+        with open(GOLDEN_FILE, "w") as f:
+            f.write("{\n" + ",\n".join(f"  {json.dumps(pid)}: {json.dumps(ids)}" for pid, ids in golden.items()) + "\n}\n")
+        print(f"Wrote {len(profiles)} golden rankings to {GOLDEN_FILE}")
+        return
+
+    workdir = tempfile.mkdtemp()
+    print(f"=== Quality ({len(profiles)} profiles, {len(golden_companies)} companies) ===")
+    for name, result in evaluate_quality(build_engines(golden_companies, workdir), profiles, load_golden()).items():
+        print(f"{name:>9}: overlap mean {result['mean_overlap']:.3f} min {result['min_overlap']:.2f} | "
+              f"exact {result['exact']}/{result['profiles']} | filter violations {len(result['violations'])}")
+
+    sizes = [int(a) for a in argv if a.isdigit()] or [100, 1000, 10000]
+    print("=== Latency per rank_companies call (ms) ===")
+    for size in sizes:
+        engines = build_engines(synthetic_companies(size), workdir)
+        runs = max(10, min(len(profiles), 200000 // size))
+        for name, engine in engines.items():
+            lat = measure_latency(engine, profiles, runs)
+            print(f"{size:>7} {name:>9}: p50 {lat[50]:8.2f} | p95 {lat[95]:8.2f} | p99 {lat[99]:8.2f}  ({runs} calls)")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,66 @@
+import time
+
+from app.services.affinity_service import AffinityIndex, RESUME_SEPARATOR
+from app.services.company_service import build_snapshot
+from app.services.matching_service import rank_companies
+
+CONTEXT = "Assessment Mode: fast\nQ: Which language?\nA: Java\nQ: Skills?\nA: react and c++\n"
+RESUME = f"{RESUME_SEPARATOR}Data analyst with Python and SQL. Web developer."
+
+def test_affinity_ranking_matches_regex_ranking(companies, tmp_path):
+    snapshot, _ = build_snapshot(companies)
+    index = AffinityIndex(db_path=tmp_path / "affinity.db")
+    for context, resume in [(CONTEXT, RESUME), (CONTEXT, ""), ("", RESUME), (CONTEXT, RESUME_SEPARATOR)]:
+        affinity = index.profile_affinity(snapshot, context, resume)
+        assert rank_companies(context + resume, snapshot, affinity=affinity) == rank_companies(context + resume, companies)
+
+def test_resume_vector_is_persisted_and_invalidated(companies, tmp_path):
+    db_path = tmp_path / "affinity.db"
+    snapshot, _ = build_snapshot(companies)
+    first = AffinityIndex(db_path=db_path)
+    first.profile_affinity(snapshot, CONTEXT, RESUME)
+    assert first.stats["resume_misses"] == 1
+
+    # A returning user in another process: no rescan of the resume
+    second = AffinityIndex(db_path=db_path)
+    second.profile_affinity(snapshot, CONTEXT.replace("Java", "Python"), RESUME)
+    second.profile_affinity(snapshot, CONTEXT, RESUME)
+    assert second.stats["resume_db_hits"] == 1 and second.stats["resume_hits"] == 1
+    assert second.stats["resume_misses"] == 0
+
+    # companies.json changed: the old vectors are dropped
+    changed, _ = build_snapshot(companies + [{"id": 4, "name": "D", "role": "ML Engineer", "location": "Remote", "skills": []}])
+    third = AffinityIndex(db_path=db_path)
+    third.profile_affinity(changed, CONTEXT, RESUME)
+    assert third.stats["resume_misses"] == 1
+    assert third._db().execute("SELECT COUNT(*) FROM resume_affinity").fetchone()[0] == 1
+
+def test_plain_lists_are_not_indexed(companies, tmp_path):
+    assert AffinityIndex(db_path=tmp_path / "affinity.db").profile_affinity(companies, CONTEXT, RESUME) is None
+
+def test_persisted_vectors_are_pruned_by_age_and_count(companies, tmp_path):
+    snapshot, _ = build_snapshot(companies)
+    index = AffinityIndex(db_path=tmp_path / "affinity.db", max_age=3600, max_rows=2)
+    for i in range(4):
+        index.profile_affinity(snapshot, CONTEXT, f"{RESUME} Resume {i}.")
+    now = time.time()
+    with index._db() as conn:
+        conn.execute("UPDATE resume_affinity SET created_at = ? - 10 + rowid", (now,))
+        conn.execute("UPDATE resume_affinity SET created_at = ? - 7200 WHERE rowid = 1", (now,))
+
+    assert index.prune(now) == 2  # the expired row, then the oldest over the row budget
+    rows = index._db().execute("SELECT rowid FROM resume_affinity ORDER BY rowid").fetchall()
+    assert rows == [(3,), (4,)]
+
+def test_line_cache_is_bounded_by_stored_rows(tmp_path):
+    companies = [{"id": i, "name": f"N{i}", "role": "Developer", "location": "Remote", "skills": ["Python"]}
+                 for i in range(1, 101)]
+    snapshot, _ = build_snapshot(companies)
+    index = AffinityIndex(db_path=tmp_path / "affinity.db", cache_rows=500)
+    for i in range(10):
+        index.profile_affinity(snapshot, f"A: python {i}\n", "")  # every line matches all 100 rows
+    assert index._lines.rows == 200  # two 100-row vectors fit in the 250-row line budget
+
+    # Still exact after evictions
+    affinity = index.profile_affinity(snapshot, "A: python 0\n", "")
+    assert rank_companies("A: python 0\n", snapshot, affinity=affinity) == rank_companies("A: python 0\n", companies)
@@ -0,0 +1,52 @@
+import gzip
+
+from fastapi.testclient import TestClient
+
+import main
+from app.quiz import QUESTIONS_DB
+from app.routes.views import STATIC_ASSETS
+
+client = TestClient(main.app)
+
+def test_questions_payload_and_revalidation():
+    r = client.get("/api/questions/fast")
+    assert r.status_code == 200
+    assert r.json() == QUESTIONS_DB["fast"]
+    assert r.headers["cache-control"] == "public, max-age=3600"
+
+    etag = r.headers["etag"]
+    r = client.get("/api/questions/fast", headers={"If-None-Match": etag})
+    assert r.status_code == 304 and r.content == b""
+
+    assert client.get("/api/questions/unknown").status_code == 404
+
+def test_index_links_hashed_assets():
+    r = client.get("/")
+    assert r.status_code == 200 and r.headers["cache-control"] == "no-cache"
+    assert f'/static/style.css?v={STATIC_ASSETS["style.css"].digest}' in r.text
+    assert f'/script.js?v={STATIC_ASSETS["script.js"].digest}' in r.text
+
+def test_static_compression_and_cache_busting():
+    asset = STATIC_ASSETS["style.css"]
+    r = client.get(f"/static/style.css?v={asset.digest}", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["content-encoding"] == "gzip"
+    assert r.headers["cache-control"] == "public, max-age=31536000, immutable"
+    assert r.content == asset.variants["identity"]  # client transparently decompresses
+    assert gzip.decompress(asset.variants["gzip"]) == asset.variants["identity"]
+
+    r = client.get("/static/style.css", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in r.headers
+    assert r.headers["cache-control"] == "no-cache"
+    identity = {"Accept-Encoding": "identity", "If-None-Match": r.headers["etag"]}
+    assert client.get("/static/style.css", headers=identity).status_code == 304
+    # A cached identity copy doesn't validate the gzip variant
+    assert client.get("/static/style.css", headers={**identity, "Accept-Encoding": "gzip"}).status_code == 200
+
+    assert client.get("/static/../main.py").status_code == 404
+
+def test_head_returns_headers_only():
+    for url in ["/", "/script.js", "/static/style.css"]:
+        get, head = client.get(url), client.head(url)
+        assert head.status_code == 200 and head.content == b""
+        assert head.headers["etag"] == get.headers["etag"]
+        assert head.headers["content-length"] == get.headers["content-length"]
@@ -0,0 +1,57 @@
+import os
+import time
+
+from app.services.cleanup_service import RetentionSweeper
+
+def make_file(directory, name, size, age):
+    path = directory / name
+    path.write_bytes(b"x" * size)
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+    return path
+
+def test_age_and_size_budgets_evict_oldest_first(tmp_path):
+    old = make_file(tmp_path, "old.pdf", 100, age=3 * 3600)
+    mid = make_file(tmp_path, "mid.pdf", 100, age=2 * 3600)
+    new = make_file(tmp_path, "new.pdf", 100, age=1 * 3600)
+    fresh = make_file(tmp_path, "fresh.pdf", 100, age=10)
+
+    sweeper = RetentionSweeper(policies={"pdf": {"path": tmp_path, "max_age": int(2.5 * 3600), "max_bytes": 250}}, grace=60)
+    assert sweeper.sweep() == 200  # "old" by age, then "mid" by size
+
+    assert not old.exists() and not mid.exists()
+    assert new.exists() and fresh.exists()
+    stats = sweeper.metrics()["directories"]["pdf"]
+    assert stats["reclaimed_files"] == 2 and stats["current_bytes"] == 200
+
+def test_leased_and_recent_files_are_protected(tmp_path):
+    leased = make_file(tmp_path, "report.pdf", 100, age=3600)
+    recent = make_file(tmp_path, "upload.pdf", 100, age=5)
+
+    sweeper = RetentionSweeper(policies={"pdf": {"path": tmp_path, "max_age": 60, "max_bytes": 1}}, grace=30)
+    sweeper.acquire(leased)
+    assert sweeper.sweep() == 0
+    assert leased.exists() and recent.exists()
+
+    sweeper.release(leased)
+    assert sweeper.sweep() == 0  # the lease refreshed its mtime
+    os.utime(leased, (time.time() - 3600, time.time() - 3600))
+    assert sweeper.sweep() == 100
+    assert not leased.exists() and recent.exists()
+
+def test_lease_protects_file_from_sweepers_in_other_workers(tmp_path):
+    report = make_file(tmp_path, "report.pdf", 100, age=3600)
+    policies = {"pdf": {"path": tmp_path, "max_age": 60, "max_bytes": 0}}
+    serving, other = RetentionSweeper(policies=policies, grace=30), RetentionSweeper(policies=policies, grace=30)
+
+    serving.acquire(report)
+    assert other.sweep() == 0 and report.exists()
+
+def test_storage_metrics_are_local_only():
+    from fastapi.testclient import TestClient
+    import main
+
+    assert TestClient(main.app).get("/api/metrics/storage").status_code == 403
+    local = TestClient(main.app, client=("127.0.0.1", 50000)).get("/api/metrics/storage")
+    assert local.status_code == 200
+    assert set(local.json()["directories"]) == {"resume", "pdf", "analysis"}
@@ -0,0 +1,68 @@
+import json
+import os
+
+from app.services.company_service import CompanyIndex
+from app.services.matching_service import rank_companies
+
+def write(path, data):
+    path.write_text(json.dumps(data))
+    # Bump mtime explicitly so back-to-back writes are always detected
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+def test_reload_reuses_unchanged_entries(companies, tmp_path):
+    path = tmp_path / "companies.json"
+    write(path, companies)
+    index = CompanyIndex(path=path)
+    before = index.snapshot()
+    assert index.reload() is None  # unchanged file
+
+    updated = [dict(c) for c in companies[:2]] + [{"id": 4, "name": "D", "role": "ML Engineer", "location": "Remote", "skills": ["Python"]}]
+    updated[1]["skills"] = ["Vue", "JavaScript"]
+    write(path, updated)
+
+    changes = index.reload()
+    assert changes == {"added": [4], "updated": [2], "removed": [3]}
+
+    after = index.snapshot()
+    assert after is not before and after.version == before.version + 1
+    assert after.matchers[1] is before.matchers[1]        # untouched entry reused
+    assert after.matchers[2] is not before.matchers[2]    # changed entry recompiled
+    assert [c["id"] for c in before] == [1, 2, 3]          # old snapshot left intact
+    assert rank_companies("i know vue and javascript", after)[0]["id"] == 2
+
+def test_broken_file_keeps_current_snapshot(companies, tmp_path):
+    path = tmp_path / "companies.json"
+    write(path, companies)
+    index = CompanyIndex(path=path)
+    path.write_text('[{"id": 1,')
+    assert index.reload(force=True) is None
+    assert len(index.snapshot()) == 3
+
+def test_duplicate_or_missing_ids_are_rejected(companies, tmp_path):
+    path = tmp_path / "companies.json"
+    write(path, companies)
+    index = CompanyIndex(path=path)
+    before = index.snapshot()
+
+    write(path, companies + [dict(companies[0], name="A2")])
+    assert index.reload() is None
+    write(path, companies + [{"name": "No Id", "role": "Tester", "skills": []}])
+    assert index.reload() is None
+    assert index.snapshot() is before
+
+    write(path, companies + [dict(companies[0])])
+    assert len(CompanyIndex(path=path).snapshot()) == 0
+
+def test_payload_that_is_not_a_list_of_objects_is_rejected(companies, tmp_path):
+    path = tmp_path / "companies.json"
+    write(path, {"companies": companies})
+    index = CompanyIndex(path=path)
+    assert len(index.snapshot()) == 0
+
+    write(path, companies)
+    assert index.reload() is not None
+    before = index.snapshot()
+    write(path, companies + ["D"])
+    assert index.reload() is None
+    assert index.snapshot() is before
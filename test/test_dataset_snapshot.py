@@ -0,0 +1,67 @@
+import json
+import os
+import struct
+
+from app.services.dataset_service import MappedCompanies, compile_snapshot, open_snapshot
+from app.services.matching_service import rank_companies
+
+def test_snapshot_round_trip(companies, tmp_path):
+    path = compile_snapshot(companies, tmp_path / "companies.bin")
+    mapped = MappedCompanies(path)
+    assert len(mapped) == 3
+    assert list(mapped) == companies
+    assert mapped.filter_fields(0) == ("indore", 4.0, None)
+    assert mapped.filter_fields(1) == ("remote", None, "remote")
+    assert mapped.match_fields(2) == ("java developer", ["java", "spring"])
+
+def test_mapped_ranking_matches_list_ranking(companies, tmp_path):
+    source = tmp_path / "companies.json"
+    source.write_text("[]")
+    mapped = open_snapshot(source, tmp_path / "companies.bin", companies=companies)
+
+    profiles = ["python sql data analyst", "javascript and react, some java", "spring java developer"]
+    preferences = [None, {"location": "Indore Only", "ctc_range": "3-5 LPA", "work_environment": ""},
+                   {"location": "Anywhere in Central India", "ctc_range": "", "work_environment": "Remote & Flexible"}]
+    for profile in profiles:
+        for prefs in preferences:
+            assert rank_companies(profile, mapped, prefs) == rank_companies(profile, companies, prefs)
+
+def test_missing_or_broken_source_does_not_raise(companies, tmp_path):
+    path = tmp_path / "companies.bin"
+    assert len(open_snapshot(tmp_path / "missing.json", path)) == 0
+
+    source = tmp_path / "companies.json"
+    compile_snapshot(companies, path)
+    source.write_text('[{"id": 1,')  # newer than the snapshot, but unreadable
+    os.utime(source, ns=(0, os.stat(path).st_mtime_ns + 1_000_000_000))
+    assert list(open_snapshot(source, path)) == companies
+
+def test_invalid_ids_keep_the_current_mapped_snapshot(companies, tmp_path):
+    from app.services.company_service import CompanyIndex
+
+    source, path = tmp_path / "companies.json", tmp_path / "companies.bin"
+    source.write_text(json.dumps([dict(c, id=f"C{c['id']}") for c in companies]))
+    index = CompanyIndex(path=source, mapped=True, snapshot_path=path)
+    assert len(index.snapshot()) == 0
+
+    source.write_text(json.dumps(companies))
+    os.utime(source, ns=(0, os.stat(path).st_mtime_ns + 1_000_000_000))
+    assert index.reload() == {"rows": 3}
+
+    source.write_text(json.dumps(companies + [{"name": "No Id", "role": "Tester", "skills": []}]))
+    os.utime(source, ns=(0, os.stat(path).st_mtime_ns + 2_000_000_000))
+    index.reload()
+    assert list(index.snapshot()) == companies
+
+def test_unusable_snapshot_is_recompiled(companies, tmp_path):
+    source, path = tmp_path / "companies.json", tmp_path / "companies.bin"
+    source.write_text(json.dumps(companies))
+    truncated = compile_snapshot(companies, path).read_bytes()[:-5]
+    old_version = struct.pack("<4sIIIQQQ", b"PLCY", 1, 0, 0, 36, 36, 36)
+    for content in [b"", b"PLCY", old_version, truncated]:
+        path.write_bytes(content)
+        os.utime(path, ns=(0, os.stat(source).st_mtime_ns + 1_000_000_000))  # newer than the source
+        assert list(open_snapshot(source, path)) == companies
+
+    path.write_bytes(truncated)  # and no source to rebuild from
+    assert len(open_snapshot(tmp_path / "missing.json", path)) == 0
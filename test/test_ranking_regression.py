@@ -0,0 +1,19 @@
+import pytest
+
+from test.ranking_harness import (build_engines, evaluate_quality, load_golden,
+                                  synthetic_companies, synthetic_profiles)
+
+@pytest.fixture(scope="module")
+def quality_report(tmp_path_factory):
+    companies = synthetic_companies()
+    engines = build_engines(companies, tmp_path_factory.mktemp("engines"))
+    return evaluate_quality(engines, synthetic_profiles(), load_golden())
+
+def test_every_engine_matches_golden_top5(quality_report):
+    for name, result in quality_report.items():
+        assert result["mean_overlap"] == 1.0, name
+        assert result["exact"] == result["profiles"], name
+
+def test_no_hard_filter_violations(quality_report):
+    for name, result in quality_report.items():
+        assert result["violations"] == [], name
@@ -0,0 +1,20 @@
+from app.resume_parser import read_pdf_text
+from app.services import resume_service
+from test.helpers import make_pdf
+
+def test_stops_reading_at_char_budget(tmp_path):
+    path = make_pdf(tmp_path / "resume.pdf", pages=5)
+    full = read_pdf_text(str(path))
+    assert "Page 5." in full
+
+    partial = read_pdf_text(str(path), max_chars=500)
+    assert len(partial) == 500
+    assert full.startswith(partial)
+
+def test_extract_runs_in_pool(tmp_path, monkeypatch):
+    make_pdf(tmp_path / "resume.pdf", pages=2)
+    monkeypatch.setattr(resume_service, "RESUME_DIR", tmp_path)
+
+    text = resume_service.extract_resume_text("resume.pdf", max_chars=0)
+    assert "Page 1." in text and "Page 2." in text
+    assert resume_service.extract_resume_text("missing.pdf") == ""
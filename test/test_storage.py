@@ -0,0 +1,39 @@
+import json
+
+from app.services.storage_service import AssessmentStore, export_jsonl, query_assessments
+
+def test_batched_writes_and_export(tmp_path):
+    db_path = tmp_path / "assessments.db"
+    store = AssessmentStore(db_path=db_path, batch_size=10, flush_interval=0.05)
+
+    # Two records in the same second must both survive (old JSON logs overwrote each other)
+    for provider in ["Gemini", "Groq", "Gemini"]:
+        store.record("fast", {"q_1": "Python"}, provider, {provider: 0.5}, {"readiness_score": 70})
+    store.record("detailed", {}, None, {}, {"readiness_score": 0}, resume_used=True)
+    store.flush()
+
+    rows = list(query_assessments(db_path=db_path))
+    assert len(rows) == 4
+    assert rows[0]["answers"] == {"q_1": "Python"}
+    assert rows[-1]["resume_used"] is True
+
+    assert len(list(query_assessments(provider="Gemini", db_path=db_path))) == 2
+    assert len(list(query_assessments(mode="detailed", db_path=db_path))) == 1
+
+    out = tmp_path / "export.jsonl"
+    assert export_jsonl(out, db_path=db_path, mode="fast") == 3
+    lines = out.read_text().splitlines()
+    assert json.loads(lines[0])["response"] == {"readiness_score": 70}
+
+def test_writer_survives_unopenable_database(tmp_path):
+    db_dir = tmp_path / "missing"
+    store = AssessmentStore(db_path=db_dir / "assessments.db", flush_interval=0.01,
+                            max_queued=2, retry_delay=0.01, max_retry_delay=0.05)
+    for i in range(3):
+        store.record("fast", {}, "Gemini", {}, {"readiness_score": i})
+    assert store.dropped == 1
+    assert store.flush(timeout=0.1) is False  # still retrying the connection
+
+    db_dir.mkdir()
+    assert store.flush(timeout=5) is True
+    assert [r["response"]["readiness_score"] for r in query_assessments(db_path=db_dir / "assessments.db")] == [0, 1]